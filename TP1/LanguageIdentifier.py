@@ -0,0 +1,175 @@
+import itertools
+import os
+import re
+import numpy as np
+from scipy import sparse
+
+LANGUAGES = ["English", "French", "Italian"]
+ACCENTS = str.maketrans("áéíóúüÁÉÍÓÚÜ", "aeiouuAEIOUU")
+# \W y \d por línea, conservando los saltos de línea que separan las líneas
+NOISE = re.compile(r'[^\w\n]|\d')
+NEWLINE = ord("\n")
+
+def clean_lines(lines: list) -> bytes:
+    """
+    Normaliza un bloque de líneas como los métodos de punto6 (minúsculas, sin acentos,
+    sin caracteres especiales ni números) y lo devuelve codificado, una línea por renglón.
+    """
+    text = "".join(lines)
+    if not text.endswith("\n"):
+        text += "\n"
+    text = NOISE.sub("", text.lower().translate(ACCENTS))
+    return text.encode("ISO-8859-1", errors="replace")
+
+def line_chunks(url: str, chunk_size: int = 100000, encoding: str = "ISO-8859-1"):
+    """Genera las líneas del archivo en listas de a lo sumo chunk_size líneas."""
+    with open(url, 'r', encoding=encoding) as file:
+        while True:
+            lines = list(itertools.islice(file, chunk_size))
+            if not lines:
+                break
+            yield lines
+
+def ngram_codes(buffer: np.ndarray, order: int) -> tuple:
+    """
+    Devuelve (línea, código) de cada n-grama de caracteres de buffer, sin cruzar saltos
+    de línea. El código de un n-grama son sus bytes leídos como un entero en base 256.
+    """
+    newlines = buffer == NEWLINE
+    n = len(buffer) - order + 1
+    if n <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    valid = ~newlines[:n]
+    codes = buffer[:n].astype(np.int64)
+    for k in range(1, order):
+        valid &= ~newlines[k:n + k]
+        codes = codes * 256 + buffer[k:n + k]
+    line_ids = np.cumsum(newlines) - newlines  # número de línea de cada byte
+    return line_ids[:n][valid], codes[valid]
+
+class LanguageIdentifier:
+    """
+    Identificación de idioma por correlación entre el perfil de n-gramas de cada línea
+    y el de cada idioma. Los perfiles se entrenan una vez sobre un índice fijo de n-gramas
+    y cada bloque de líneas se puntúa contra todos los idiomas con productos de matrices.
+    """
+
+    def __init__(self, order: int = 1, languages: list = None):
+        self.order = order
+        self.languages = languages or LANGUAGES
+        self.set_counts(np.zeros(0, dtype=np.uint32), np.zeros((len(self.languages), 0), dtype=np.uint32))
+
+    def set_counts(self, features: np.ndarray, counts: np.ndarray) -> None:
+        """Fija el índice de n-gramas (códigos ordenados) y la cantidad de cada uno por idioma."""
+        self.features = features.astype(np.int64)
+        self.counts = counts
+        totals = counts.sum(axis=1, keepdims=True)
+        self.profiles = counts / np.maximum(totals, 1)  # frecuencias relativas por idioma
+
+    def train(self, url: str, encoding: str = "ISO-8859-1") -> "LanguageIdentifier":
+        identifier = train_profiles(url, [self.order], self.languages, encoding)[self.order]
+        self.set_counts(identifier.features, identifier.counts)
+        return self
+
+    def score(self, lines: list) -> np.ndarray:
+        """
+        Correlación de Pearson de cada línea con cada idioma (líneas x idiomas), calculada
+        sobre la unión de los n-gramas de la línea y del idioma como np.corrcoef.
+        """
+        line_ids, codes = ngram_codes(np.frombuffer(clean_lines(lines), dtype=np.uint8), self.order)
+        n_lines = len(lines)
+        # cantidad de cada n-grama distinto de cada línea
+        pairs, counts = np.unique(line_ids * 256 ** self.order + codes, return_counts=True)
+        line_ids, codes = pairs // 256 ** self.order, pairs % 256 ** self.order
+        sum_x = np.bincount(line_ids, counts, minlength=n_lines)
+        sum_xx = np.bincount(line_ids, counts.astype(np.float64) ** 2, minlength=n_lines)
+
+        index = np.minimum(np.searchsorted(self.features, codes), max(len(self.features) - 1, 0))
+        known = self.features[index] == codes if len(self.features) else np.zeros(len(codes), dtype=bool)
+        unknown = np.bincount(line_ids[~known], minlength=n_lines)  # n-gramas que ningún idioma tiene
+        matrix = sparse.csr_matrix((counts[known].astype(np.float64), (line_ids[known], index[known])),
+                                   shape=(n_lines, len(self.features)))
+        present = matrix.copy()
+        present.data[:] = 1
+
+        profiles = self.profiles
+        missing = (profiles == 0).astype(np.float64)  # n-gramas entrenados que el idioma no tiene
+        n = (profiles > 0).sum(axis=1) + unknown[:, None] + present @ missing.T
+        sum_y = profiles.sum(axis=1)
+        sum_yy = (profiles ** 2).sum(axis=1)
+        sum_xy = matrix @ profiles.T
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covariance = n * sum_xy - sum_x[:, None] * sum_y
+            variance = (n * sum_xx[:, None] - sum_x[:, None] ** 2) * (n * sum_yy - sum_y ** 2)
+            correlation = covariance / np.sqrt(variance)
+        return np.where(n > 1, correlation, 0)
+
+    def classify(self, lines: list) -> tuple:
+        """Devuelve (idiomas, puntajes): el idioma de mayor correlación de cada línea, o None."""
+        scores = np.nan_to_num(self.score(lines), nan=-np.inf)
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(lines)), best]
+        languages = [self.languages[i] if s > -1 else None for i, s in zip(best.tolist(), best_scores.tolist())]
+        return languages, np.where(best_scores > -1, best_scores, -1)
+
+    def classify_file(self, url_test: str, chunk_size: int = 100000, encoding: str = "ISO-8859-1"):
+        """Clasifica el archivo por bloques de chunk_size líneas y genera (línea, idioma, puntaje)."""
+        for lines in line_chunks(url_test, chunk_size, encoding):
+            languages, scores = self.classify(lines)
+            yield from zip((line.strip().lower() for line in lines), languages, scores.tolist())
+
+def train_profiles(url: str, orders: list = (1, 2, 3), languages: list = None, encoding: str = "ISO-8859-1") -> dict:
+    """
+    Entrena los perfiles de todos los órdenes leyendo y normalizando cada archivo de
+    entrenamiento una sola vez. Devuelve {orden: LanguageIdentifier}.
+    """
+    languages = languages or LANGUAGES
+    counts = {order: [] for order in orders}
+    for language in languages:
+        with open(url + language, 'r', encoding=encoding) as file:
+            buffer = np.frombuffer(clean_lines(file.readlines()), dtype=np.uint8)
+        for order in orders:
+            _, codes = ngram_codes(buffer, order)
+            counts[order].append(np.unique(codes, return_counts=True))
+
+    identifiers = {}
+    for order in orders:
+        features = np.unique(np.concatenate([codes for codes, _ in counts[order]]))
+        matrix = np.zeros((len(languages), len(features)), dtype=np.uint32)
+        for i, (codes, frequencies) in enumerate(counts[order]):
+            matrix[i, np.searchsorted(features, codes)] = frequencies
+        identifiers[order] = LanguageIdentifier(order, languages)
+        identifiers[order].set_counts(features, matrix)
+    return identifiers
+
+def save_profiles(identifiers: dict, path: str) -> None:
+    """Guarda los perfiles de todos los órdenes en un solo archivo binario (.npz) con enteros de 32 bits."""
+    arrays = {}
+    for order, identifier in identifiers.items():
+        arrays[f"features_{order}"] = identifier.features.astype(np.uint32)  # hasta trigramas entran en 32 bits
+        arrays[f"counts_{order}"] = identifier.counts
+    languages = next(iter(identifiers.values())).languages
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as file:
+        np.savez(file, orders=list(identifiers), languages=languages, **arrays)
+
+def load_profiles(path: str) -> dict:
+    with np.load(path) as data:
+        languages = [str(language) for language in data["languages"]]
+        identifiers = {}
+        for order in data["orders"].tolist():
+            identifiers[order] = LanguageIdentifier(order, languages)
+            identifiers[order].set_counts(data[f"features_{order}"], data[f"counts_{order}"])
+    return identifiers
+
+def load_or_train_profiles(url: str, path: str = None, orders: list = (1, 2, 3)) -> dict:
+    """Carga los perfiles guardados en path o los entrena y los guarda ahí."""
+    if path is not None and os.path.isfile(path):
+        identifiers = load_profiles(path)
+        if all(order in identifiers for order in orders):
+            return identifiers
+    identifiers = train_profiles(url, orders)
+    if path is not None:
+        save_profiles(identifiers, path)
+    return identifiers
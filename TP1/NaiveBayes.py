@@ -0,0 +1,107 @@
+import os
+from collections import deque
+import numpy as np
+from scipy import sparse
+from LanguageIdentifier import LANGUAGES, clean_lines, line_chunks, ngram_codes
+from parallel import map_stream
+
+HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+def hashed_ngrams(lines: list, orders: range, bits: int) -> tuple:
+    """
+    Devuelve (línea, cubeta) de los n-gramas de caracteres de cada orden de las líneas.
+    Cada n-grama se lleva a una de 2**bits cubetas con un hash multiplicativo del código
+    del n-grama y su orden, así la tabla de probabilidades tiene tamaño fijo.
+    """
+    buffer = np.frombuffer(clean_lines(lines), dtype=np.uint8)
+    line_ids, buckets = [], []
+    for order in orders:
+        ids, codes = ngram_codes(buffer, order)
+        keys = codes.astype(np.uint64) ^ (np.uint64(order) << np.uint64(56))
+        line_ids.append(ids)
+        buckets.append((keys * HASH_MULTIPLIER) >> np.uint64(64 - bits))
+    return np.concatenate(line_ids), np.concatenate(buckets).astype(np.int64)
+
+class NaiveBayes:
+    """
+    Naive Bayes multinomial sobre n-gramas de caracteres (n = 1..5) con hashing. Las
+    log-probabilidades se guardan en una tabla float32 de idiomas x 2**bits cubetas.
+    """
+
+    def __init__(self, orders: range = range(1, 6), bits: int = 18, alpha: float = 0.5, languages: list = None):
+        self.orders = orders
+        self.bits = bits
+        self.alpha = alpha
+        self.languages = languages or LANGUAGES
+        self.log_priors = np.zeros(len(self.languages), dtype=np.float32)
+        self.log_probabilities = np.zeros((len(self.languages), 2 ** bits), dtype=np.float32)
+
+    def train(self, url: str, encoding: str = "ISO-8859-1") -> "NaiveBayes":
+        lines_per_language = np.zeros(len(self.languages))
+        for i, language in enumerate(self.languages):
+            with open(url + language, 'r', encoding=encoding) as file:
+                lines = file.readlines()
+            _, buckets = hashed_ngrams(lines, self.orders, self.bits)
+            counts = np.bincount(buckets, minlength=2 ** self.bits) + self.alpha
+            self.log_probabilities[i] = np.log(counts / counts.sum())
+            lines_per_language[i] = len(lines)
+        self.log_priors = np.log(lines_per_language / lines_per_language.sum()).astype(np.float32)
+        return self
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as file:
+            np.savez(file, orders=np.array(self.orders), bits=self.bits, alpha=self.alpha, languages=self.languages,
+                     log_priors=self.log_priors, log_probabilities=self.log_probabilities)
+
+    @classmethod
+    def load(cls, path: str) -> "NaiveBayes":
+        with np.load(path) as data:
+            orders = data["orders"].tolist()
+            model = cls(range(orders[0], orders[-1] + 1), int(data["bits"]), float(data["alpha"]),
+                        [str(language) for language in data["languages"]])
+            model.log_priors = data["log_priors"]
+            model.log_probabilities = data["log_probabilities"]
+        return model
+
+    @classmethod
+    def load_or_train(cls, url: str, path: str = None) -> "NaiveBayes":
+        """Carga el modelo guardado en path o lo entrena y lo guarda ahí."""
+        if path is not None and os.path.isfile(path):
+            return cls.load(path)
+        model = cls().train(url)
+        if path is not None:
+            model.save(path)
+        return model
+
+    def score(self, lines: list) -> np.ndarray:
+        """Log-probabilidad (sin normalizar) de cada línea en cada idioma (líneas x idiomas)."""
+        line_ids, buckets = hashed_ngrams(lines, self.orders, self.bits)
+        counts = sparse.csr_matrix((np.ones(len(buckets), dtype=np.float32), (line_ids, buckets)),
+                                   shape=(len(lines), 2 ** self.bits))
+        return counts @ self.log_probabilities.T + self.log_priors
+
+    def classify(self, lines: list) -> tuple:
+        """Devuelve (idiomas, puntajes): el idioma más probable de cada línea y su log-probabilidad."""
+        scores = self.score(lines)
+        best = scores.argmax(axis=1)
+        return [self.languages[i] for i in best.tolist()], scores[np.arange(len(lines)), best]
+
+    def classify_file(self, url_test: str, workers: int = 1, chunk_size: int = 100000, encoding: str = "ISO-8859-1"):
+        """
+        Clasifica el archivo por bloques de chunk_size líneas, repartidos entre workers
+        procesos, y genera (línea, idioma, puntaje) en el orden del archivo.
+        """
+        # los bloques enviados se guardan aquí: los workers solo devuelven las predicciones,
+        # que llegan en el mismo orden en que se enviaron los bloques
+        sent = deque()
+        def chunks():
+            for lines in line_chunks(url_test, chunk_size, encoding):
+                sent.append(lines)
+                yield lines
+        for languages, scores in map_stream(classify_chunk, chunks(), workers, self):
+            lines = sent.popleft()
+            yield from zip((line.strip().lower() for line in lines), languages, scores.tolist())
+
+def classify_chunk(lines: list, model: NaiveBayes) -> tuple:
+    return model.classify(lines)
@@ -0,0 +1,120 @@
+import hashlib
+import heapq
+import math
+import numpy as np
+
+def hash64(term: str, seed: int = 0) -> int:
+    # hash estable entre ejecuciones (hash() de Python cambia en cada proceso)
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8, salt=seed.to_bytes(8, "little")).digest(), "little")
+
+class HyperLogLog:
+    """
+    Estimación de la cantidad de términos distintos en memoria fija: 2**p registros de un
+    byte, con p elegido para un error relativo típico de 1.04 / sqrt(2**p).
+    Se usa como un set del que solo importa len().
+    """
+
+    def __init__(self, error: float = 0.01):
+        self.p = min(max(math.ceil(math.log2((1.04 / error) ** 2)), 4), 18)
+        self.m = 2 ** self.p
+        self.registers = bytearray(self.m)
+        self.alpha = 0.7213 / (1 + 1.079 / self.m)
+
+    def add(self, term: str) -> None:
+        h = hash64(term)
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = 64 - self.p - rest.bit_length() + 1  # posición del primer 1 en los bits restantes
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self) -> float:
+        registers = np.frombuffer(self.registers, dtype=np.uint8)
+        estimate = self.alpha * self.m ** 2 / np.sum(np.ldexp(1.0, -registers.astype(np.int32)))
+        zeros = self.m - np.count_nonzero(registers)
+        if estimate <= 2.5 * self.m and zeros:
+            return self.m * math.log(self.m / zeros)  # corrección para pocos elementos (linear counting)
+        return float(estimate)
+
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+    def __len__(self) -> int:
+        return round(self.estimate())
+
+class SpaceSaving:
+    """
+    Términos más frecuentes (heavy hitters) en memoria fija con Space-Saving: se guardan
+    a lo sumo capacity contadores y un término nuevo reemplaza al de menor cuenta,
+    heredando esa cuenta como error. Cada cuenta sobreestima la real en a lo sumo su error,
+    y el error nunca supera total / capacity.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.heap = []  # (cuenta, término), con entradas viejas que se descartan al sacarlas
+        self.total = 0
+
+    def add(self, term: str, count: int = 1) -> None:
+        self.total += count
+        if term in self.counts:
+            self.counts[term] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[term] = count
+            self.errors[term] = 0
+        else:
+            minimum, victim = heapq.heappop(self.heap)
+            while self.counts.get(victim) != minimum:
+                minimum, victim = heapq.heappop(self.heap)
+            del self.counts[victim]
+            del self.errors[victim]
+            self.counts[term] = minimum + count
+            self.errors[term] = minimum
+        heapq.heappush(self.heap, (self.counts[term], term))
+        if len(self.heap) > 4 * self.capacity:
+            self.heap = [(count, term) for term, count in self.counts.items()]
+            heapq.heapify(self.heap)
+
+    def top(self, n: int = None) -> list:
+        """Los n términos de mayor cuenta como (término, cuenta, error), de mayor a menor."""
+        rows = sorted(((term, count, self.errors[term]) for term, count in self.counts.items()),
+                      key=lambda row: (-row[1], row[0]))
+        return rows[:n] if n is not None else rows
+
+    def max_error(self) -> int:
+        """Cota del error de cualquier cuenta: la menor cuenta guardada si se llenó la tabla."""
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+class CountMin:
+    """
+    Frecuencia aproximada de cualquier término en una tabla fija de depth x width
+    contadores. La estimación nunca es menor que la real y la supera en a lo sumo
+    epsilon * total con probabilidad 1 - delta.
+    """
+
+    def __init__(self, epsilon: float = 0.0001, delta: float = 0.01):
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.epsilon = epsilon
+        self.delta = delta
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.rows = np.arange(self.depth)
+        self.total = 0
+
+    def _columns(self, term: str) -> np.ndarray:
+        # depth funciones de hash a partir de un solo hash de 64 bits (h1 + i * h2)
+        h = hash64(term, seed=1)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return (h1 + self.rows * h2) % self.width
+
+    def add(self, term: str, count: int = 1) -> None:
+        self.total += count
+        self.table[self.rows, self._columns(term)] += count
+
+    def estimate(self, term: str) -> int:
+        return int(self.table[self.rows, self._columns(term)].min())
+
+    def error_bound(self) -> float:
+        return self.epsilon * self.total
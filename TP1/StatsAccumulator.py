@@ -0,0 +1,102 @@
+import heapq
+import numpy as np
+from Vocabulary import Vocabulary
+from TermRows import TermRows
+
+class StatsAccumulator:
+    """
+    Estadísticas de estadisticas.txt y frecuencias.txt calculadas en una sola pasada,
+    sin guardar las filas (doc, term, tf): la memoria depende del vocabulario.
+    """
+
+    def __init__(self, k: int = 10):
+        self.k = k
+        self.vocabulary = Vocabulary(keep_docs=False)
+        self.documents = 0
+        self.total_tokens = 0
+        self.terms_length = 0    # suma de los largos de los términos distintos
+        self.one_time_terms = 0  # términos con df == 1
+        self.min_doc = None      # {"doc", "tf", "terms"} del documento más corto
+        self.max_doc = None      # {"doc", "tf", "terms"} del documento más largo
+        # Heaps acotados a k filas. El mínimo de cada heap es la fila a descartar:
+        # a igual tf se conserva la que aparece antes (doc, posición), como el sort estable.
+        self.top = []     # (tf, -doc, -posición, term)
+        self.bottom = []  # (-tf, -doc, -posición, term)
+
+    def _push(self, heap: list, row: tuple) -> None:
+        if len(heap) < self.k:
+            heapq.heappush(heap, row)
+        else:
+            heapq.heappushpop(heap, row)
+
+    def _add_length(self, document: dict) -> None:
+        if document["tf"] == 0:
+            return  # como en docs(), los documentos sin tokens no son el más corto ni el más largo
+        if self.min_doc is None or document["tf"] < self.min_doc["tf"]:
+            self.min_doc = document
+        if self.max_doc is None or document["tf"] > self.max_doc["tf"]:
+            self.max_doc = document
+
+    def _count_term(self, term: str, previous_df: int, df: int) -> None:
+        if previous_df == 0:
+            self.terms_length += len(term)
+        self.one_time_terms += (df == 1) - (previous_df == 1)
+
+    def add_document(self, doc: int, document_terms: list) -> None:
+        """Agrega la salida de terms() de un documento; doc debe crecer entre llamadas."""
+        doc_tokens = 0
+        for position, term in enumerate(document_terms):
+            term_id = self.vocabulary.add_term(term["term"], term["tf"])
+            df = self.vocabulary.entries[term_id]["df"]
+            self._count_term(term["term"], df - 1, df)
+            doc_tokens += term["tf"]
+            self._push(self.top, (term["tf"], -doc, -position, term["term"]))
+            self._push(self.bottom, (-term["tf"], -doc, -position, term["term"]))
+
+        self.documents += 1
+        self.total_tokens += doc_tokens
+        self._add_length({"doc": doc, "tf": doc_tokens, "terms": len(document_terms)})
+
+    def add_rows(self, rows: TermRows) -> None:
+        """Agrega un lote de documentos posterior a los ya agregados, con agregaciones vectorizadas."""
+        tf, df = rows.term_totals()
+        for term, term_tf, term_df in zip(rows.terms, tf.tolist(), df.tolist()):
+            previous_df = self.vocabulary[term]["df"] if term in self.vocabulary else 0
+            self.vocabulary.add_totals(term, term_tf, term_df)
+            self._count_term(term, previous_df, previous_df + term_df)
+
+        documents, tokens, n_terms = rows.doc_lengths()
+        self.documents += len(documents)
+        self.total_tokens += int(tokens.sum())
+        non_empty = np.flatnonzero(tokens > 0)
+        if len(non_empty):
+            lengths = tokens[non_empty]
+            for i in (int(non_empty[np.argmin(lengths)]), int(non_empty[np.argmax(lengths)])):
+                self._add_length({"doc": int(documents[i]), "tf": int(tokens[i]), "terms": int(n_terms[i])})
+
+        for tf, doc, position, term in rows.extremes(self.k, largest=True):
+            self._push(self.top, (tf, -doc, -position, term))
+        for tf, doc, position, term in rows.extremes(self.k, largest=False):
+            self._push(self.bottom, (-tf, -doc, -position, term))
+
+    def avg_term_length(self) -> float:
+        # sin términos (colección vacía o todo stopwords) el promedio es 0
+        return self.terms_length / len(self.vocabulary) if len(self.vocabulary) else 0.0
+
+    def per_document(self, value: float) -> float:
+        """Promedio de value por documento, 0 si no hay documentos."""
+        return value / self.documents if self.documents else 0.0
+
+    def length_extremes(self) -> tuple:
+        """(tokens, términos) del documento más corto y del más largo, con 0 si ningún documento tiene tokens."""
+        empty = {"tf": 0, "terms": 0}
+        min_doc, max_doc = self.min_doc or empty, self.max_doc or empty
+        return min_doc["tf"], min_doc["terms"], max_doc["tf"], max_doc["terms"]
+
+    def most_frequent(self) -> list:
+        """Las k filas (term, tf) de mayor tf, de mayor a menor."""
+        return [(term, tf) for tf, _, _, term in sorted(self.top, reverse=True)]
+
+    def least_frequent(self) -> list:
+        """Las k filas (term, tf) de menor tf, de menor a mayor."""
+        return [(term, -tf) for tf, _, _, term in sorted(self.bottom, reverse=True)]
@@ -0,0 +1,68 @@
+import hashlib
+import os
+import pickle
+from array import array
+
+class StatsCache:
+    """
+    Caché persistente de los términos (term, tf) de cada archivo. Una entrada vale mientras
+    no cambien el tamaño y el mtime del archivo; la configuración del tokenizador (stopwords,
+    stemming, patrones) elige el archivo de caché, así que cambiarla no reutiliza entradas.
+    La configuración se arma con los valores que usa el tokenizador (el texto de los patrones,
+    la huella de la tabla de acentos) y no a mano, para que no quede desactualizada.
+    """
+
+    def __init__(self, cache_dir: str, config: dict):
+        key = hashlib.sha1(repr(sorted(config.items())).encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(cache_dir, f"stats_{key}.pkl")
+        self.entries = {}  # {ruta absoluta: ((tamaño, mtime), términos, tfs)}
+        if os.path.isfile(self.path):
+            with open(self.path, "rb") as file:
+                self.entries = pickle.load(file)
+        self.pending = {}  # claves de los archivos que faltan procesar
+        self.seen = set()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def file_key(path: str) -> tuple:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def fingerprint(value: str) -> str:
+        """Huella de un valor largo de la configuración, como una tabla de traducción."""
+        return hashlib.sha1(value.encode("utf-8", "surrogatepass")).hexdigest()
+
+    @classmethod
+    def stopwords_key(cls, stopwords: bool, stopwords_path: str = None):
+        """Ruta, tamaño y mtime del archivo de stopwords, o None si no se usan."""
+        return (os.path.abspath(stopwords_path), cls.file_key(stopwords_path)) if stopwords else None
+
+    def lookup(self, path: str):
+        """Devuelve (términos, tfs) si el archivo no cambió desde que se guardó, o None."""
+        path = os.path.abspath(path)
+        key = self.file_key(path)
+        self.seen.add(path)
+        entry = self.entries.get(path)
+        if entry is None or entry[0] != key:
+            self.pending[path] = key
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def store(self, path: str, terms_data: list) -> None:
+        """Guarda la salida de terms() de un archivo con la clave tomada en lookup."""
+        path = os.path.abspath(path)
+        key = self.pending.pop(path)
+        self.entries[path] = (key, tuple(term["term"] for term in terms_data), array('I', (term["tf"] for term in terms_data)))
+
+    def save(self) -> None:
+        # descarto los archivos que ya no están en la colección
+        self.entries = {path: entry for path, entry in self.entries.items() if path in self.seen}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(self.entries, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,81 @@
+from array import array
+import numpy as np
+
+class TermRows:
+    """
+    Filas (doc, term, tf) de un lote de documentos guardadas en columnas array('I')
+    paralelas, con los términos internados en una tabla term_id -> término.
+    Cada fila ocupa 12 bytes en lugar de un diccionario por fila.
+    """
+
+    def __init__(self):
+        self.term_ids = {}         # {"term": term_id} local al lote
+        self.terms = []            # term_id -> término
+        self.documents = array('I')  # todos los documentos agregados, incluso los vacíos
+        self.doc_col = array('I')
+        self.term_col = array('I')
+        self.tf_col = array('I')
+
+    def __len__(self):
+        return len(self.tf_col)
+
+    def intern(self, term: str) -> int:
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self.term_ids[term] = term_id
+            self.terms.append(term)
+        return term_id
+
+    def add_document(self, doc: int, document_terms: list) -> None:
+        """Agrega la salida de terms() de un documento; doc debe crecer entre llamadas."""
+        self.documents.append(doc)
+        for term in document_terms:
+            self.doc_col.append(doc)
+            self.term_col.append(self.intern(term["term"]))
+            self.tf_col.append(term["tf"])
+
+    def nbytes(self) -> int:
+        return sum(column.itemsize * len(column) for column in (self.documents, self.doc_col, self.term_col, self.tf_col))
+
+    def columns(self) -> tuple:
+        """Vistas NumPy (sin copia) de las columnas doc, term_id y tf."""
+        return (np.frombuffer(self.doc_col, dtype=np.uint32),
+                np.frombuffer(self.term_col, dtype=np.uint32),
+                np.frombuffer(self.tf_col, dtype=np.uint32))
+
+    def term_totals(self) -> tuple:
+        """tf y df de cada term_id del lote."""
+        _, terms, tfs = self.columns()
+        tf = np.bincount(terms, weights=tfs, minlength=len(self.terms)).astype(np.int64)
+        df = np.bincount(terms, minlength=len(self.terms))
+        return tf, df
+
+    def doc_lengths(self) -> tuple:
+        """(documentos, tokens por documento, términos por documento), en el orden de agregado."""
+        docs, _, tfs = self.columns()
+        documents = np.frombuffer(self.documents, dtype=np.uint32)
+        positions = np.searchsorted(documents, docs)
+        tokens = np.bincount(positions, weights=tfs, minlength=len(documents)).astype(np.int64)
+        n_terms = np.bincount(positions, minlength=len(documents))
+        return documents, tokens, n_terms
+
+    def extremes(self, k: int, largest: bool) -> list:
+        """
+        Las k filas de mayor (o menor) tf como (tf, doc, posición en el documento, term).
+        A igual tf se respeta el orden de las filas, como un sort estable.
+        """
+        docs, terms, tfs = self.columns()
+        if len(tfs) == 0:
+            return []
+        keys = -tfs.astype(np.int64) if largest else tfs.astype(np.int64)
+        if len(keys) > k:
+            # solo las filas que pueden entrar en el top-k, incluidos los empates del borde
+            threshold = np.partition(keys, k - 1)[k - 1]
+            candidates = np.flatnonzero(keys <= threshold)
+        else:
+            candidates = np.arange(len(keys))
+        rows = candidates[np.argsort(keys[candidates], kind="stable")[:k]]
+        starts = np.searchsorted(docs, docs[rows])
+        return [(int(tfs[row]), int(docs[row]), int(row - start), self.terms[terms[row]])
+                for row, start in zip(rows, starts)]
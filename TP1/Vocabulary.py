@@ -0,0 +1,58 @@
+class Vocabulary:
+    """Vocabulario de una colección con tf, df y documentos por término, actualizado en O(1)."""
+
+    def __init__(self, keep_docs: bool = True):
+        self.keep_docs = keep_docs
+        self.term_ids = {}  # {"term": term_id}
+        self.entries = []   # [{"term", "df", "tf", "docs"}] indexado por term_id
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, term):
+        return term in self.term_ids
+
+    def __getitem__(self, term):
+        return self.entries[self.term_ids[term]]
+
+    def add_term(self, term: str, tf: int, doc=None) -> int:
+        """Suma una aparición del término en un documento y devuelve su term_id."""
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = len(self.entries)
+            self.term_ids[term] = term_id
+            entry = {"term": term, "df": 1, "tf": tf}
+            if self.keep_docs:
+                entry["docs"] = [doc]
+            self.entries.append(entry)
+        else:
+            entry = self.entries[term_id]
+            entry["df"] += 1
+            entry["tf"] += tf
+            if self.keep_docs:
+                entry["docs"].append(doc)
+        return term_id
+
+    def add_document(self, doc, document_terms: list) -> None:
+        """Agrega la salida de terms() de un documento."""
+        for term in document_terms:
+            self.add_term(term["term"], term["tf"], doc)
+
+    def add_totals(self, term: str, tf: int, df: int) -> int:
+        """Suma tf y df ya agregados sobre varios documentos; no actualiza la lista de documentos."""
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = len(self.entries)
+            self.term_ids[term] = term_id
+            entry = {"term": term, "df": df, "tf": tf}
+            if self.keep_docs:
+                entry["docs"] = []
+            self.entries.append(entry)
+        else:
+            self.entries[term_id]["df"] += df
+            self.entries[term_id]["tf"] += tf
+        return term_id
+
+    def data(self) -> list:
+        """Lista de términos con el formato que usan las funciones de accounting."""
+        return list(self.entries)
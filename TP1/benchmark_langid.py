@@ -0,0 +1,127 @@
+import json
+import random
+import sys
+import time
+import tracemalloc
+import numpy as np
+from langdetect import detector_factory
+from LanguageIdentifier import LanguageIdentifier
+from NaiveBayes import NaiveBayes
+from parallel import pop_option
+from punto6 import detect_language
+
+# Compara los métodos de identificación de idioma de punto6: entrenamiento, memoria del
+# modelo, líneas por segundo en bloque, latencia por línea y exactitud, sobre el test
+# y sobre una entrada sintética con las líneas del test repetidas y mezcladas.
+
+class LangdetectModel:
+    def classify(self, lines: list) -> tuple:
+        return [detect_language(line.strip().lower()) for line in lines], None
+
+def train_langdetect(url: str) -> LangdetectModel:
+    # carga de cero los perfiles de langdetect (si no, se cargan en el primer detect)
+    detector_factory._factory = None
+    detector_factory.init_factory()
+    return LangdetectModel()
+
+METHODS = {
+    "correlacion-unigramas": lambda url: LanguageIdentifier(1).train(url),
+    "correlacion-bigramas": lambda url: LanguageIdentifier(2).train(url),
+    "correlacion-trigramas": lambda url: LanguageIdentifier(3).train(url),
+    "naive-bayes": lambda url: NaiveBayes().train(url),
+    "langdetect": train_langdetect,
+}
+
+def read_test(url_test: str, url_solution: str) -> tuple:
+    with open(url_test, 'r', encoding='ISO-8859-1') as file:
+        lines = file.readlines()
+    with open(url_solution, 'r', encoding='ISO-8859-1') as file:
+        labels = [line.strip().split(" ", 1)[1] for line in file]
+    return lines, labels
+
+def scaled(lines: list, labels: list, scale: int, seed: int = 0) -> tuple:
+    rows = list(zip(lines, labels)) * scale
+    random.Random(seed).shuffle(rows)
+    return [line for line, _ in rows], [label for _, label in rows]
+
+def train(method: str, url: str) -> tuple:
+    """Devuelve (modelo, segundos de entrenamiento, bytes que retiene el modelo)."""
+    start = time.perf_counter()
+    model = METHODS[method](url)
+    train_time = time.perf_counter() - start
+    # se entrena de nuevo con tracemalloc, que haría más lenta la medición de tiempo
+    tracemalloc.start()
+    retained = METHODS[method](url)
+    model_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+    return model, train_time, model_bytes
+
+def throughput(model, lines: list, chunk_size: int = 100000) -> tuple:
+    """Clasifica las líneas en bloques y devuelve (predicciones, líneas por segundo)."""
+    predictions = []
+    start = time.perf_counter()
+    for i in range(0, len(lines), chunk_size):
+        predictions.extend(model.classify(lines[i:i + chunk_size])[0])
+    return predictions, len(lines) / (time.perf_counter() - start)
+
+def latencies(model, lines: list) -> np.ndarray:
+    """Milisegundos de clasificar cada línea sola."""
+    times = []
+    for line in lines:
+        start = time.perf_counter()
+        model.classify([line])
+        times.append(time.perf_counter() - start)
+    return np.array(times) * 1000
+
+def accuracy(predictions: list, labels: list) -> float:
+    return float(np.mean([prediction == label for prediction, label in zip(predictions, labels)]))
+
+def benchmark(method: str, url: str, lines: list, labels: list, scale: int, sample: int) -> dict:
+    model, train_time, model_bytes = train(method, url)
+    predictions, test_lines_per_second = throughput(model, lines)
+    scaled_lines, scaled_labels = scaled(lines, labels, scale)
+    scaled_predictions, scaled_lines_per_second = throughput(model, scaled_lines)
+    latency = latencies(model, lines[:sample])
+    return {
+        "method": method,
+        "train_seconds": train_time,
+        "model_bytes": model_bytes,
+        "test_lines": len(lines),
+        "test_lines_per_second": test_lines_per_second,
+        "scaled_lines": len(scaled_lines),
+        "scaled_lines_per_second": scaled_lines_per_second,
+        "latency_p50_ms": float(np.percentile(latency, 50)),
+        "latency_p99_ms": float(np.percentile(latency, 99)),
+        "accuracy": accuracy(predictions, labels),
+        "scaled_accuracy": accuracy(scaled_predictions, scaled_labels),
+    }
+
+def main():
+    # python benchmark_langid.py [--scale 100] [--sample 1000] [--methods m1,m2] [--json resultados.json]
+    args, scale = pop_option(sys.argv, "--scale")
+    args, sample = pop_option(args, "--sample")
+    args, methods = pop_option(args, "--methods")
+    _, json_path = pop_option(args, "--json")
+    methods = methods.split(",") if methods else list(METHODS)
+    scale = int(scale) if scale else 100
+    sample = int(sample) if sample else 1000
+    url = "languageIdentificationData/training/"
+    lines, labels = read_test("languageIdentificationData/test", "languageIdentificationData/solution")
+
+    results = []
+    print(f"{'método':<22} {'entren. (s)':>11} {'modelo (KiB)':>12} {'líneas/s':>10} {'líneas/s x' + str(scale):>14} "
+          f"{'p50 (ms)':>9} {'p99 (ms)':>9} {'exactitud':>9}")
+    for method in methods:
+        result = benchmark(method, url, lines, labels, scale, sample)
+        results.append(result)
+        print(f"{method:<22} {result['train_seconds']:>11.3f} {result['model_bytes'] / 1024:>12.0f} "
+              f"{result['test_lines_per_second']:>10.0f} {result['scaled_lines_per_second']:>14.0f} "
+              f"{result['latency_p50_ms']:>9.3f} {result['latency_p99_ms']:>9.3f} {result['accuracy']:>9.3f}")
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import sys
+import tracemalloc
+from benchmark_vocabulary import synthetic_collection
+from TermRows import TermRows
+
+# Memoria de las filas (doc, term, tf): lista de diccionarios contra columnas de TermRows.
+
+def dict_rows(documents) -> list:
+    doc_data = []
+    for i, document_terms in enumerate(documents):
+        for term in document_terms:
+            doc_data.append({"doc": i, "term": term["term"], "tf": term["tf"]})
+    return doc_data
+
+def columnar_rows(documents) -> TermRows:
+    rows = TermRows()
+    for i, document_terms in enumerate(documents):
+        rows.add_document(i, document_terms)
+    return rows
+
+def peak_memory(function, documents) -> tuple:
+    tracemalloc.start()
+    result = function(documents)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(result), peak
+
+def main():
+    # python benchmark_rows.py [cantidad_de_documentos]
+    n_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    documents = list(synthetic_collection(n_docs))
+    n_rows, dict_peak = peak_memory(dict_rows, documents)
+    _, columnar_peak = peak_memory(columnar_rows, documents)
+    print(f"Filas: {n_rows}")
+    print(f"Diccionarios: {dict_peak / 2**20:.1f} MiB ({dict_peak / n_rows:.0f} bytes por fila)")
+    print(f"TermRows: {columnar_peak / 2**20:.1f} MiB ({columnar_peak / n_rows:.0f} bytes por fila)")
+
+if __name__ == "__main__":
+    main()
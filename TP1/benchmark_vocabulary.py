@@ -0,0 +1,62 @@
+import itertools
+import random
+import sys
+import time
+from Vocabulary import Vocabulary
+
+# Compara el vocabulario basado en diccionario contra el recorrido lineal de la lista
+# `data` que usaban los scripts de TP1, sobre colecciones sintéticas con distribución Zipf.
+
+def synthetic_collection(n_docs: int, vocabulary_size: int = 10000, doc_length: int = 100, seed: int = 0):
+    rng = random.Random(seed)
+    words = [f"t{i}" for i in range(vocabulary_size)]
+    cum_weights = list(itertools.accumulate(1 / (i + 1) for i in range(vocabulary_size)))
+    for _ in range(n_docs):
+        tokens = rng.choices(words, cum_weights=cum_weights, k=doc_length)
+        counts = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        yield [{"term": term, "tf": tf} for term, tf in sorted(counts.items())]
+
+def linear_scan(documents) -> list:
+    data = []
+    for i, document_terms in enumerate(documents):
+        for term in document_terms:
+            for element in data:
+                if element["term"] == term["term"]:
+                    element["df"] += 1
+                    element["tf"] += term["tf"]
+                    element["docs"].append(i)
+                    break
+            else:
+                data.append({"term": term["term"], "df": 1, "tf": term["tf"], "docs": [i]})
+    return data
+
+def hashed(documents) -> list:
+    vocabulary = Vocabulary()
+    for i, document_terms in enumerate(documents):
+        vocabulary.add_document(i, document_terms)
+    return vocabulary.data()
+
+def main():
+    # python benchmark_vocabulary.py [max_docs_lineal]
+    linear_limit = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print(f"{'docs':>8} {'terminos':>10} {'dict (s)':>10} {'lineal (s)':>12}")
+    for n_docs in (1000, 10000, 100000):
+        documents = list(synthetic_collection(n_docs))
+
+        start = time.perf_counter()
+        data = hashed(documents)
+        hashed_time = time.perf_counter() - start
+
+        linear_time = "-"
+        if n_docs <= linear_limit:
+            start = time.perf_counter()
+            linear_data = linear_scan(documents)
+            linear_time = f"{time.perf_counter() - start:.3f}"
+            assert sorted(linear_data, key=lambda x: x["term"]) == sorted(data, key=lambda x: x["term"])
+
+        print(f"{n_docs:>8} {len(data):>10} {hashed_time:>10.3f} {linear_time:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import collections
+from concurrent.futures import ProcessPoolExecutor
+
+def pop_option(args: list, name: str) -> tuple[list, str]:
+    """Quita la opción `name VALOR` de los argumentos y devuelve (argumentos, VALOR o None)."""
+    if name not in args:
+        return args, None
+    index = args.index(name)
+    if index + 1 >= len(args):
+        print(f"Falta el valor de {name}.")
+        raise SystemExit(1)
+    return args[:index] + args[index + 2:], args[index + 1]
+
+def parse_workers(args: list) -> tuple[list, int]:
+    """Quita la opción --workers N de los argumentos y devuelve (argumentos, N)."""
+    args, value = pop_option(args, "--workers")
+    if value is None:
+        return args, 1
+    if not value.isdigit() or int(value) <= 0:
+        print("El valor de --workers debe ser un entero mayor que 0.")
+        raise SystemExit(1)
+    return args, int(value)
+
+def map_chunks(function, items: list, workers: int = 1, *args, chunk_size: int = 1000):
+    """
+    Aplica function(chunk, *args) sobre porciones contiguas de a lo sumo chunk_size
+    items y devuelve los resultados en el orden de los items, a medida que están listos.
+    Con workers > 1 las porciones se reparten en un pool de procesos, por lo que
+    function debe estar definida a nivel de módulo. Como en map_stream, hay a lo sumo
+    2 * workers porciones en vuelo: los resultados no consumidos no se acumulan.
+    """
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    if len(chunks) <= 1:
+        workers = 1
+    yield from map_stream(function, chunks, workers, *args)
+
+_shared_args = ()
+
+def _set_shared_args(args: tuple) -> None:
+    global _shared_args
+    _shared_args = args
+
+def _call_with_shared_args(function, chunk):
+    return function(chunk, *_shared_args)
+
+def map_stream(function, chunks, workers: int = 1, *args):
+    """
+    Como map_chunks, pero sobre un iterable de porciones que se consume a medida que
+    avanza (por ejemplo un archivo leído por bloques), con a lo sumo 2 * workers porciones
+    en vuelo. Los args se envían una sola vez a cada proceso y no con cada porción.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield function(chunk, *args)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_set_shared_args, initargs=(args,)) as pool:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_call_with_shared_args, function, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -1,8 +1,6 @@
-import pandas as pd
-import numpy as np
-import os
 import re
 import json
+from Vocabulary import Vocabulary
 
 def terms(data: list) -> dict:
     data.sort()
@@ -44,40 +42,17 @@ def accounting(data: list):
     print(f"Total tokens: {total_tokens}")
     print(f"Total tokens (debug): {collection_data["statistics"]["num_tokens"]}")
 
-def term_in_data(data: list, term: str) -> bool:
-    for element in data:
-        if element["term"] == term:
-            return True
-    return False
-
-def set_term(data: list, term: str, tf: int, doc: int) -> list:
-    for element in data:
-        if element["term"] == term:
-            element["df"] += 1
-            element["tf"] += tf
-            element["docs"].append(doc)
-            return data
-
 def main():
-    data = []
+    vocabulary = Vocabulary()
     for i in range (10000):
         url = f"TestCollection/doc{i}.txt"
         with open(url, 'r') as file:
             text = file.read()
             tokens_list = tokenize(text)
         document_terms = terms(tokens_list)
-        for term in document_terms:
-            if not term_in_data(data,term["term"]):
-                data.append({
-                    "term": term["term"],
-                    "df": 1,
-                    "tf": term["tf"],
-                    "docs": [i]
-                })
-            else:
-                set_term(data, term["term"], term["tf"], i)
+        vocabulary.add_document(i, document_terms)
 
-    accounting(data)
+    accounting(vocabulary.data())
 
 
 if __name__ == "__main__":
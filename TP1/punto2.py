@@ -1,36 +1,30 @@
-import pandas as pd
-import numpy as np
 import os
 import re
 import sys
-import unicodedata
+from StatsAccumulator import StatsAccumulator
+from TermRows import TermRows
+from StatsCache import StatsCache
+from parallel import map_chunks, parse_workers, pop_option
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'TP4', 'utils')))
+from Tokenizer import FOLD_LOWER, StopwordFilter
 
-def remove_accents(text):
-        replacement = str.maketrans("áéíóúüÁÉÍÓÚÜ", "aeiouuAEIOUU")
-        if isinstance(text, list):  # Si es una lista, procesar cada palabra
-            return [word.translate(replacement) for word in text]
-        elif isinstance(text, str):  # Si es una cadena, procesarla directamente
-            return text.translate(replacement)
-        else:
-            raise TypeError("El argumento debe ser una lista o una cadena.")
+NON_LETTERS = r'[^a-z]'  # lo que separa los términos, después de quitar acentos y pasar a minúsculas
 
 def tokenize(text: str, stopwords: bool, stopwords_path: str = None) -> list:
-    text = text.lower()
-    
-    text = remove_accents(text)
-    text = re.sub(r'[^a-z]', " ", text)
+    # minúsculas y acentos en una sola pasada con la misma tabla
+    text = text.translate(FOLD_LOWER)
+    text = re.sub(NON_LETTERS, " ", text)
     text = text.split()
     if stopwords:
-        with open(stopwords_path, 'r') as file:
-            stopwords = file.read()
-        stopwords = stopwords.lower()
-        stopwords = remove_accents(stopwords)
-        stopwords = re.sub(r'[^a-z]', " ", stopwords)
-        stopwords = stopwords.split()
-        # print(stopwords)
-        text = [word for word in text if word not in stopwords]
+        # las stopwords se separan igual que el texto: todo lo que no es a-z
+        text = StopwordFilter.load(stopwords_path, NON_LETTERS + '+').filter(text)
     return text
 
+def cache_config(stopwords: bool, stopwords_path: str = None) -> dict:
+    """Configuración de la caché tomada de lo que usa tokenize."""
+    return {"separators": NON_LETTERS, "folding": StatsCache.fingerprint(FOLD_LOWER),
+            "stopwords": StatsCache.stopwords_key(stopwords, stopwords_path)}
+
 def terms(data: list) -> dict:
     data.sort()
     unique = []
@@ -49,143 +43,90 @@ def terms(data: list) -> dict:
         unique.append({"term": last_word, "tf": count})
     return unique
 
-def term_in_data(data: list, term: str) -> bool:
-    for element in data:
-        if element["term"] == term:
-            return True
-    return False
-
-def set_term(data: list, term: str, tf: int, doc: int) -> list:
-    for element in data:
-        if element["term"] == term:
-            element["df"] += 1
-            element["tf"] += tf
-            element["docs"].append(doc)
-            return data
-
-def read_files(path: str, stopwords: bool, stopwords_path: str = None) -> list:
-    files = os.listdir(path)
-    data = []
-    doc_data = []
-    for i, file in enumerate(files):
-        with open(f"{path}/{file}", 'r', encoding="utf-8") as file:
-            text = file.read()
-            text_tokens = tokenize(text, stopwords, stopwords_path)
-            terms_data = terms(text_tokens)
-        for term in terms_data:
-            doc_data.append({
-                "doc": i,
-                "term": term["term"],
-                "tf": term["tf"]
-            })
-            if not term_in_data(data,term["term"]):
-                data.append({
-                    "term": term["term"],
-                    "df": 1,
-                    "tf": term["tf"],
-                    "docs": [i]
-                })
-            else:
-                set_term(data, term["term"], term["tf"], i)
-    return data, doc_data
-
-def docs(doc_data: list) -> list:
-    doc_data = sorted(doc_data, key=lambda x: x["doc"])
-    docs = []
-    last_doc = -1
-    term_count = 0
-    tf_total = 0
-    for doc in doc_data:
-        if doc["doc"] != last_doc:
-            term_count = 0
-            tf_total = 0
-            docs.append({
-                "doc": doc["doc"],
-                "terms": term_count,
-                "tf": tf_total
-            })
-            last_doc = doc["doc"]
+def read_chunk(chunk: list, path: str, stopwords: bool, stopwords_path: str = None) -> tuple:
+    rows = TermRows()
+    computed = {}  # {doc: terms_data} de los archivos que no estaban en caché
+    for i, file, cached in chunk:
+        if cached is None:
+            with open(f"{path}/{file}", 'r', encoding="utf-8") as file:
+                text = file.read()
+                text_tokens = tokenize(text, stopwords, stopwords_path)
+                terms_data = terms(text_tokens)
+            computed[i] = terms_data
         else:
-            term_count += 1
-            tf_total += doc["tf"]
-            docs[-1]["terms"] = term_count
-            docs[-1]["tf"] = tf_total
-    
-    return docs
-
-def accounting(path: str, data: list, doc_data: list) -> None:
+            terms_data = [{"term": term, "tf": tf} for term, tf in zip(*cached)]
+        rows.add_document(i, terms_data)
+    return rows, computed
+
+def read_files(path: str, stopwords: bool, stopwords_path: str = None, workers: int = 1, cache_dir: str = None) -> StatsAccumulator:
+    names = os.listdir(path)
+    cache = None
+    if cache_dir is not None:
+        cache = StatsCache(cache_dir, cache_config(stopwords, stopwords_path))
+    files = [(i, file, cache.lookup(f"{path}/{file}") if cache else None) for i, file in enumerate(names)]
+
+    stats = StatsAccumulator()
+    for rows, computed in map_chunks(read_chunk, files, workers, path, stopwords, stopwords_path):
+        stats.add_rows(rows)
+        if cache:
+            for i, terms_data in computed.items():
+                cache.store(f"{path}/{names[i]}", terms_data)
+    if cache:
+        cache.save()
+        print(f"Caché: {cache.hits} archivos reutilizados, {cache.misses} procesados")
+    return stats
+
+def accounting(stats: StatsAccumulator) -> None:
     # terminos.txt
-    sorted_terms = sorted(data, key=lambda x: x["term"])
+    sorted_terms = sorted(stats.vocabulary.data(), key=lambda x: x["term"])
     with open('terminos.txt', 'w') as file:
         for term in sorted_terms:
-            file.write(f"{term['term']} {term["tf"]} {term['df']}\n")
+            file.write(f"{term['term']} {term['tf']} {term['df']}\n")
     
     # estadisticas.txt
-    files = os.listdir(path)
-    total_tokens = 0
-    for term in data:
-        total_tokens += term["tf"]
-    
-    term_large = 0
-    for term in data:
-        term_large += len(term["term"])
-    avg_term_large = term_large/len(data)
-
-    
-    documents = docs(doc_data)
-    min_doc_length = min(documents, key=lambda x: x["tf"])
-    max_doc_length = max(documents, key=lambda x: x["tf"])
-
-    one_time_terms = [term for term in data if term["df"] == 1]
-    
+    total_tokens = stats.total_tokens
+    n_docs = stats.documents
     with open('estadisticas.txt', 'w') as file:
-        file.write(f"{len(files)}\n")
+        file.write(f"{n_docs}\n")
         file.write(f"{total_tokens} {len(sorted_terms)}\n")
-        file.write(f"{total_tokens/len(files)} {len(sorted_terms)/len(files)}\n")
-        file.write(f"{avg_term_large}\n")
-        file.write(f"{min_doc_length['tf']} {min_doc_length['terms']} {max_doc_length['tf']} {max_doc_length['terms']}\n")
-        file.write(f"{len(one_time_terms)}\n")
+        file.write(f"{stats.per_document(total_tokens)} {stats.per_document(len(sorted_terms))}\n")
+        file.write(f"{stats.avg_term_length()}\n")
+        file.write("{} {} {} {}\n".format(*stats.length_extremes()))
+        file.write(f"{stats.one_time_terms}\n")
 
     # frecuencias.txt
-    major_to_minor_terms = sorted(doc_data, key=lambda x: x["tf"], reverse=True)
-    minor_to_major_terms = sorted(doc_data, key=lambda x: x["tf"], reverse=False)
     with open('frecuencias.txt', 'w') as file:
-        for i, term in enumerate(major_to_minor_terms):
-            if i < 10:
-                file.write(f"{term['term']} {term['tf']}\n")
-            else:
-                break
-        for i, term in enumerate(minor_to_major_terms):
-            if i < 10:
-                file.write(f"{term['term']} {term['tf']}\n")
-            else:
-                break
-
+        for term, tf in stats.most_frequent():
+            file.write(f"{term} {tf}\n")
+        for term, tf in stats.least_frequent():
+            file.write(f"{term} {tf}\n")
 
 def main():
-    if len(sys.argv) < 3 or (sys.argv[2] == "1" and len(sys.argv) != 4) or (sys.argv[2] == "0" and len(sys.argv) != 3):
+    args, workers = parse_workers(sys.argv)
+    args, cache_dir = pop_option(args, "--cache")
+    if len(args) < 3 or (args[2] == "1" and len(args) != 4) or (args[2] == "0" and len(args) != 3):
         print("Uso:")
-        print("python punto2.py [directorio/de/documentos] [palabras_vacias: 1|0] [directorio/de/palabras_vacias (opcional si 1)]")
+        print("python punto2.py [directorio/de/documentos] [palabras_vacias: 1|0] [directorio/de/palabras_vacias (opcional si 1)] [--workers N] [--cache directorio/de/cache]")
         sys.exit(1)
 
-    if not os.path.isdir(sys.argv[1]):
+    if not os.path.isdir(args[1]):
         print("El directorio de documentos no existe.")
         sys.exit(1)
 
-    if sys.argv[2] not in ["1", "0"]:
+    if args[2] not in ["1", "0"]:
         print("El segundo argumento debe ser 1 o 0.")
         sys.exit(1)
-    if sys.argv[2] == "1" and not os.path.isfile(sys.argv[3]):
+    if args[2] == "1" and not os.path.isfile(args[3]):
         print("El archivo de palabras vacías no existe.")
         sys.exit(1)
     
-    arg1 = sys.argv[1]
-    arg2 = sys.argv[2]
-    arg3 = sys.argv[3] if arg2 == "1" else None
+    arg1 = args[1]
+    arg2 = args[2]
+    arg3 = args[3] if arg2 == "1" else None
     arg2 = True if arg2 == "1" else False
 
-    data, doc_data = read_files(arg1, arg2, arg3)
-    accounting(arg1, data, doc_data)
+    stats = read_files(arg1, arg2, arg3, workers, cache_dir)
+    accounting(stats)
 
 if __name__ == "__main__":
     main()
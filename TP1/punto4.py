@@ -1,11 +1,12 @@
-import pandas as pd
-import numpy as np
 import os
 import re
 import sys
-import unicodedata
-import json
-import nltk.stem
+from StatsAccumulator import StatsAccumulator
+from TermRows import TermRows
+from StatsCache import StatsCache
+from parallel import map_chunks, parse_workers, pop_option
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'TP4', 'utils')))
+from Tokenizer import FOLD, StopwordFilter, fold_accents, new_stemmer
 
 class Tokenizer:
     PATTERNS = {
@@ -14,7 +15,7 @@ class Tokenizer:
         "numbers": r'\b\d{1,4}(?:[.-]?\d{1,4}){0,3}\b',
         "urls": r'\b(?:ftp|https|http)?://[^\s/$.?#].[^\s]*\b',
         "emails": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b',
-        "names": r'\b[A-Z][a-z]+(?:\s[A-Z][a-z]+)*\b(?!\.)',
+        "names": r'\b[A-Z][a-z]+(?:[ \t][A-Z][a-z]+)*\b(?!\.)',
         "dates": r'\b\d{2}[-/.]\d{2}[-/.]\d{4}\b',
         "words": r'[a-zA-ZáéíóúüñÁÉÍÓÚÜÑ]+(?:-[a-zA-Z]+)*'
     }
@@ -22,40 +23,34 @@ class Tokenizer:
     def __init__(self, **kwargs):
         patterns = [regex for key, regex in self.PATTERNS.items() if kwargs.get(key, False)]
         self.regex = re.compile('|'.join(patterns) if patterns else '|'.join(self.PATTERNS.values()))
+        self.lowercase = re.compile(r'[a-zA-Z]+(?:-[a-zA-Z]+)*')  # tokens que se pasan a minúsculas
+        self.stemming_method = "snowball"
+        self.stemmer = None  # se crea (e importa nltk) la primera vez que se usa
 
-    def remove_accents(self, text_list):
-        replacement = str.maketrans("áéíóúüÁÉÍÓÚÜ", "aeiouuAEIOUU")
-        text_without_accents = []
-        for word in text_list:
-            word = word.translate(replacement)
-            text_without_accents.append(word)
-        return text_without_accents
-    
     def stemming(self, text_list):
-        stemmer = nltk.stem.SnowballStemmer("spanish")
-        stemmed_list = [stemmer.stem(word) for word in text_list]
+        if self.stemmer is None:
+            self.stemmer = new_stemmer(self.stemming_method)
+        stemmed_list = [self.stemmer.stem(word) for word in text_list]
         return stemmed_list
 
     def remove_stopwords(self, text_list, stopwords_path):
-        with open(stopwords_path, 'r', encoding="utf-8") as file:
-            stopwords = file.read()
-        stopwords = stopwords.lower()
-        stopwords = re.split(r'[, \n]+', stopwords)
-        stopwords = self.remove_accents(stopwords)
-        text_without_stopwords = []
-        
-        for word in text_list:
-            if word not in stopwords:
-                text_without_stopwords.append(word)
-        return text_without_stopwords
+        return StopwordFilter.load(stopwords_path).filter(text_list)
+
+    def cache_config(self, stopwords: bool, stopwords_path: str = None, stemming: bool = False) -> dict:
+        """Configuración de la caché tomada de lo que usa tokenize."""
+        return {"patterns": self.regex.pattern, "lowercase": self.lowercase.pattern,
+                "folding": StatsCache.fingerprint(FOLD), "stopwords": StatsCache.stopwords_key(stopwords, stopwords_path),
+                "stemming": self.stemming_method if stemming else None}
 
     def tokenize(self, text, stopwords: bool = False, stopwords_path: str = None, stemming: bool = False):
-        text_list = self.regex.findall(text)
-        text_list = self.remove_accents(text_list)
+        # los tokens se buscan en el texto original y se toman del texto sin acentos,
+        # que tiene las mismas posiciones (cada carácter se reemplaza por uno solo)
+        folded = fold_accents(text)
+        text_list = [folded[match.start():match.end()] for match in self.regex.finditer(text)]
         processed_tokens = []
         for token in text_list:
             # Aplicar minúscula solo a palabras normales
-            if re.fullmatch(r'[a-zA-Z]+(?:-[a-zA-Z]+)*', token):
+            if self.lowercase.fullmatch(token):
                 token = token.lower()
             processed_tokens.append(token)
         if stopwords:
@@ -80,127 +75,75 @@ def terms(data: list) -> dict:
 
     if last_word != "":
         unique.append({"term": last_word, "tf": count})
-        return unique
-
-
-def term_in_data(data: list, term: str) -> bool:
-    for element in data:
-        if element["term"] == term:
-            return True
-    return False
-
-def set_term(data: list, term: str, tf: int, doc: int) -> list:
-    for element in data:
-        if element["term"] == term:
-            
-            element["df"] += 1
-            element["tf"] += tf
-            element["docs"].append(doc)
-            return data
-
-def file_reader(path: str, stopwords: bool, stopwords_path: str = None) -> list:
-    files = os.listdir(path)
-    data = []
-    doc_data = []
+    return unique
+
+
+def read_chunk(chunk: list, path: str, stopwords: bool, stopwords_path: str = None) -> tuple:
+    rows = TermRows()
+    computed = {}  # {doc: terms_data} de los archivos que no estaban en caché
     tokenizer = Tokenizer(abreviations=True, acronyms=True, urls=True, emails=True, names=True, words=True)
-    for i, file in enumerate(files):
-        with open(f"{path}/{file}", 'r', encoding="utf-8") as file:
-            text = file.read()
-            text_tokens = tokenizer.tokenize(text, stopwords, stopwords_path, True)
-            terms_data = terms(text_tokens)
-        for term in terms_data:
-            doc_data.append({
-                "doc": i,
-                "term": term["term"],
-                "tf": term["tf"]
-            })
-            if not term_in_data(data,term["term"]):
-                data.append({
-                    "term": term["term"],
-                    "df": 1,
-                    "tf": term["tf"],
-                    "docs": [i]
-                })
-            else:
-                set_term(data, term["term"], term["tf"], i)
-    return data, doc_data
-
-
-def docs(doc_data: list) -> list:
-    doc_data = sorted(doc_data, key=lambda x: x["doc"])
-    docs = []
-    last_doc = -1
-    term_count = 0
-    tf_total = 0
-    for doc in doc_data:
-        if doc["doc"] != last_doc:
-            term_count = 0
-            tf_total = 0
-            docs.append({
-                "doc": doc["doc"],
-                "terms": term_count,
-                "tf": tf_total
-            })
-            last_doc = doc["doc"]
+    for i, file, cached in chunk:
+        if cached is None:
+            with open(f"{path}/{file}", 'r', encoding="utf-8") as file:
+                text = file.read()
+                text_tokens = tokenizer.tokenize(text, stopwords, stopwords_path, True)
+                terms_data = terms(text_tokens)
+            computed[i] = terms_data
         else:
-            term_count += 1
-            tf_total += doc["tf"]
-            docs[-1]["terms"] = term_count
-            docs[-1]["tf"] = tf_total
-    
-    return docs
-
-def accounting(path: str, data: list, doc_data: list):
+            terms_data = [{"term": term, "tf": tf} for term, tf in zip(*cached)]
+        rows.add_document(i, terms_data)
+    return rows, computed
+
+def file_reader(path: str, stopwords: bool, stopwords_path: str = None, workers: int = 1, cache_dir: str = None) -> StatsAccumulator:
+    names = os.listdir(path)
+    cache = None
+    if cache_dir is not None:
+        tokenizer = Tokenizer(abreviations=True, acronyms=True, urls=True, emails=True, names=True, words=True)
+        cache = StatsCache(cache_dir, tokenizer.cache_config(stopwords, stopwords_path, stemming=True))
+    files = [(i, file, cache.lookup(f"{path}/{file}") if cache else None) for i, file in enumerate(names)]
+
+    stats = StatsAccumulator()
+    for rows, computed in map_chunks(read_chunk, files, workers, path, stopwords, stopwords_path):
+        stats.add_rows(rows)
+        if cache:
+            for i, terms_data in computed.items():
+                cache.store(f"{path}/{names[i]}", terms_data)
+    if cache:
+        cache.save()
+        print(f"Caché: {cache.hits} archivos reutilizados, {cache.misses} procesados")
+    return stats
+
+def accounting(stats: StatsAccumulator) -> None:
     # terminos.txt
-    sorted_terms = sorted(data, key=lambda x: x["term"])
+    sorted_terms = sorted(stats.vocabulary.data(), key=lambda x: x["term"])
     with open('punto4/terminos.txt', 'w', encoding="utf-8") as file:
         for term in sorted_terms:
-            file.write(f"{term['term']} {term["tf"]} {term['df']}\n")
+            file.write(f"{term['term']} {term['tf']} {term['df']}\n")
     
     # estadisticas.txt
-    files = os.listdir(path)
-    total_tokens = 0
-    for term in data:
-        total_tokens += term["tf"]
-    
-    term_large = 0
-    for term in data:
-        term_large += len(term["term"])
-    avg_term_large = term_large/len(data)
-
-    
-    documents = docs(doc_data)
-    min_doc_length = min(documents, key=lambda x: x["tf"])
-    max_doc_length = max(documents, key=lambda x: x["tf"])
-
-    one_time_terms = [term for term in data if term["df"] == 1]
-    
+    total_tokens = stats.total_tokens
+    n_docs = stats.documents
     with open('punto4/estadisticas.txt', 'w', encoding="utf-8") as file:
-        file.write(f"{len(files)}\n")
+        file.write(f"{n_docs}\n")
         file.write(f"{total_tokens} {len(sorted_terms)}\n")
-        file.write(f"{total_tokens/len(files)} {len(sorted_terms)/len(files)}\n")
-        file.write(f"{avg_term_large}\n")
-        file.write(f"{min_doc_length['tf']} {min_doc_length['terms']} {max_doc_length['tf']} {max_doc_length['terms']}\n")
-        file.write(f"{len(one_time_terms)}\n")
+        file.write(f"{stats.per_document(total_tokens)} {stats.per_document(len(sorted_terms))}\n")
+        file.write(f"{stats.avg_term_length()}\n")
+        file.write("{} {} {} {}\n".format(*stats.length_extremes()))
+        file.write(f"{stats.one_time_terms}\n")
 
     # frecuencias.txt
-    major_to_minor_terms = sorted(doc_data, key=lambda x: x["tf"], reverse=True)
-    minor_to_major_terms = sorted(doc_data, key=lambda x: x["tf"], reverse=False)
     with open('punto4/frecuencias.txt', 'w', encoding="utf-8") as file:
-        for i, term in enumerate(major_to_minor_terms):
-            if i < 10:
-                file.write(f"{term['term']} {term['tf']}\n")
-            else:
-                break
-        for i, term in enumerate(minor_to_major_terms):
-            if i < 10:
-                file.write(f"{term['term']} {term['tf']}\n")
-            else:
-                break
+        for term, tf in stats.most_frequent():
+            file.write(f"{term} {tf}\n")
+        for term, tf in stats.least_frequent():
+            file.write(f"{term} {tf}\n")
 
 def main():
-    data, doc_data = file_reader("RI-tknz-data", True, "stopwords.txt")
-    accounting("RI-tknz-data", data, doc_data)
+    # python punto4.py [--workers N] [--cache directorio/de/cache]
+    args, workers = parse_workers(sys.argv)
+    _, cache_dir = pop_option(args, "--cache")
+    stats = file_reader("RI-tknz-data", True, "stopwords.txt", workers, cache_dir)
+    accounting(stats)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,12 +1,12 @@
-import pandas as pd
-import numpy as np
 import os
 import re
 import sys
-import unicodedata
-import json
-from nltk.stem import PorterStemmer, LancasterStemmer, SnowballStemmer
 import time
+from Vocabulary import Vocabulary
+from parallel import parse_workers, pop_option
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'TP4', 'utils')))
+from TrecReader import map_trec
+from Tokenizer import CachedStemmer, StopwordFilter, fold_accents, new_stemmer
 
 class Tokenizer:
     PATTERNS = {
@@ -15,53 +15,41 @@ class Tokenizer:
         "numbers": r'\b\d{1,4}(?:[.-]?\d{1,4}){0,3}\b',
         "urls": r'\b(?:ftp|https|http)?://[^\s/$.?#].[^\s]*\b',
         "emails": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b',
-        "names": r'\b[A-Z][a-z]+(?:\s[A-Z][a-z]+)*\b(?!\.)',
+        "names": r'\b[A-Z][a-z]+(?:[ \t][A-Z][a-z]+)*\b(?!\.)',
         "dates": r'\b\d{2}[-/.]\d{2}[-/.]\d{4}\b',
         "words": r'[a-zA-ZáéíóúüñÁÉÍÓÚÜÑ]+(?:-[a-zA-Z]+)*'
     }
 
-    def __init__(self, **kwargs):
+    def __init__(self, stem_cache_size: int = 100000, stem_cache_dir: str = None, **kwargs):
         patterns = [regex for key, regex in self.PATTERNS.items() if kwargs.get(key, False)]
         self.regex = re.compile('|'.join(patterns) if patterns else '|'.join(self.PATTERNS.values()))
-        self.porter = PorterStemmer()
-        self.lancaster = LancasterStemmer()
-        self.snowball = SnowballStemmer("spanish")
-
-    def remove_accents(self, text_list):
-        replacement = str.maketrans("áéíóúüÁÉÍÓÚÜ", "aeiouuAEIOUU")
-        text_without_accents = []
-        for word in text_list:
-            word = word.translate(replacement)
-            text_without_accents.append(word)
-        return text_without_accents
-    
+        self.stem_cache_size = stem_cache_size
+        self.stem_cache_dir = stem_cache_dir
+        self.stemmers = {}  # cada stemmer se crea (e importa nltk) la primera vez que se usa
+
+    def stemmer(self, method: str) -> CachedStemmer:
+        stemmer = self.stemmers.get(method)
+        if stemmer is None:
+            path = os.path.join(self.stem_cache_dir, f"stems_{method}.pkl") if self.stem_cache_dir else None
+            stemmer = self.stemmers[method] = CachedStemmer(new_stemmer(method), self.stem_cache_size, path)
+        return stemmer
+
+    def save_stems(self):
+        for stemmer in self.stemmers.values():
+            stemmer.save()
+
     def stemming(self, text_list, method = "porter"):
-        if method == "porter":
-            stemmed_list = [self.porter.stem(word) for word in text_list]
-        elif method == "lancaster":
-            stemmed_list = [self.lancaster.stem(word) for word in text_list]
-        elif method == "snowball":
-            stemmed_list = [self.snowball.stem(word) for word in text_list]
-        else:
-            raise ValueError("Invalid method. Use 'porter', 'lancaster' or 'snowball'.")
-        return stemmed_list
+        stemmer = self.stemmer(method)
+        return [stemmer.stem(word) for word in text_list]
 
     def remove_stopwords(self, text_list, stopwords_path):
-        with open(stopwords_path, 'r', encoding="utf-8") as file:
-            stopwords = file.read()
-        stopwords = stopwords.lower()
-        stopwords = re.split(r'[, \n]+', stopwords)
-        stopwords = self.remove_accents(stopwords)
-        text_without_stopwords = []
-        
-        for word in text_list:
-            if word not in stopwords:
-                text_without_stopwords.append(word)
-        return text_without_stopwords
+        return StopwordFilter.load(stopwords_path).filter(text_list)
 
     def tokenize(self, text, stopwords: bool = False, stopwords_path: str = None, stemming: bool = False, stemming_method: str = "porter"):
-        text_list = self.regex.findall(text)
-        text_list = self.remove_accents(text_list)
+        # los tokens se buscan en el texto original y se toman del texto sin acentos,
+        # que tiene las mismas posiciones (cada carácter se reemplaza por uno solo)
+        folded = fold_accents(text)
+        text_list = [folded[match.start():match.end()] for match in self.regex.finditer(text)]
         processed_tokens = []
         for token in text_list:
             # Aplicar minúscula solo a palabras normales
@@ -90,98 +78,92 @@ def terms(data: list) -> dict:
 
     if last_word != "":
         unique.append({"term": last_word, "tf": count})
-        return unique
-
-
-def term_in_data(data: list, term: str) -> bool:
-    for element in data:
-        if element["term"] == term:
-            return True
-    return False
-
-def set_term(data: list, term: str, tf: int, doc: int) -> list:
-    for element in data:
-        if element["term"] == term:
-            element["df"] += 1
-            element["tf"] += tf
-            element["docs"].append(doc)
-            return data
-
-
-
-def parse_trec_file(url: str, stemming_method: str = "porter")->list:
-    data = []
-    tokenizer = Tokenizer(abreviations=True, acronyms=True, numbers=True, urls=True, emails=True, names=True, dates=True, words=True)
-    with open(url, "r", encoding="utf-8") as file:
-        doc_text = ""
-        doc_no = 0
-        for line in file:
-            line = line.lower()
-            line = line.strip()
-
-            if re.match(r"<doc>", line):
-                doc_text = ""
-                continue
-
-            if re.match(r"<docno>([0-9]+)</docno>", line):
-                doc_no = re.search(r"<docno>([0-9]+)</docno>", line).group(1)
-                continue
-
-            doc_text += line
-
-            if re.match(r"</doc>", line):
-                # proceso el documento encontrado
-                tokens = tokenizer.tokenize(doc_text, False, None, True, stemming_method)
-
-                document_terms = terms(tokens)
-
-                for term in document_terms:
-                    if not term_in_data(data,term["term"]):
-                        data.append({
-                            "term": term["term"],
-                            "df": 1,
-                            "tf": term["tf"],
-                            "docs": [doc_no]
-                        })
-                    else:
-                        set_term(data, term["term"], term["tf"], doc_no)
-
-    return data
-
-def accounting(data_porter: list, data_lancaster: list, time_porter: float, time_lancaster: float):
-    sorted_terms_porter = sorted(data_porter, key=lambda x: x["term"])
-    sorted_terms_lancaster = sorted(data_lancaster, key=lambda x: x["term"])
+    return unique
+
+
+TOKENIZER_OPTIONS = {"abreviations": True, "acronyms": True, "numbers": True, "urls": True, "emails": True,
+                     "names": True, "dates": True, "words": True}
+
+def tokenize_document(text: str, tokenizer: Tokenizer, stemming_method: str = "porter") -> list:
+    # sin stemming_method devuelve los tokens sin stemming
+    return tokenizer.tokenize(text.lower(), False, None, stemming_method is not None, stemming_method)
+
+_process_tokenizer = None
+
+def init_tokenizer(options: dict) -> None:
+    # un Tokenizer por proceso, creado una sola vez en lugar de enviarlo con cada lote
+    global _process_tokenizer
+    _process_tokenizer = Tokenizer(**options)
+
+def tokenize_in_process(text: str) -> list:
+    # tokens sin stemming, con el Tokenizer del proceso: el stemming se hace después, en compare_stemmers
+    return tokenize_document(text, _process_tokenizer, None)
+
+def stem_terms(tokenizer: Tokenizer, document_terms: list, stemming_method: str) -> list:
+    # stemming de los términos distintos del documento, sumando el tf de los que comparten raíz
+    stems = tokenizer.stemming([term["term"] for term in document_terms], stemming_method)
+    stem_tf = {}
+    for stem, term in zip(stems, document_terms):
+        stem_tf[stem] = stem_tf.get(stem, 0) + term["tf"]
+    return [{"term": stem, "tf": tf} for stem, tf in sorted(stem_tf.items())]
+
+def compare_stemmers(url: str, stemming_methods: list, workers: int = 1, stem_cache_dir: str = None) -> tuple:
+    """
+    Parsea y tokeniza la colección una sola vez y reparte los términos de cada documento
+    entre todos los stemmers. Devuelve el vocabulario de cada stemmer, el tiempo de
+    parseo y tokenización, y el tiempo de stemming y la tasa de aciertos de la caché
+    de raíces de cada stemmer.
+    """
+    tokenizer = Tokenizer(stem_cache_dir=stem_cache_dir, **TOKENIZER_OPTIONS)
+    vocabularies = {method: Vocabulary() for method in stemming_methods}
+    for method in stemming_methods:
+        tokenizer.stemmer(method)  # crea los stemmers antes de medir: el primero importa nltk
+    stemming_times = {method: 0.0 for method in stemming_methods}
+    parse_time = 0.0
+
+    documents = map_trec(url, tokenize_in_process, workers, initializer=init_tokenizer, initargs=(TOKENIZER_OPTIONS,))
+    while True:
+        inicio = time.perf_counter()
+        document = next(documents, None)
+        parse_time += time.perf_counter() - inicio
+        if document is None:
+            break
+        doc_no, tokens = document
+        document_terms = terms(tokens)
+        for method in stemming_methods:
+            inicio = time.perf_counter()
+            stemmed_terms = stem_terms(tokenizer, document_terms, method)
+            stemming_times[method] += time.perf_counter() - inicio
+            vocabularies[method].add_document(doc_no, stemmed_terms)
+
+    tokenizer.save_stems()
+    for method in stemming_methods:
+        stemmer = tokenizer.stemmer(method)
+        stemming_times[method] = (stemming_times[method], stemmer.hit_rate())
+    return {method: vocabulary.data() for method, vocabulary in vocabularies.items()}, parse_time, stemming_times
+
+def accounting(data: dict, parse_time: float, stemming_times: dict):
     print("Stadistics: ")
-    print(f"Total terms porter: {len(sorted_terms_porter)}")
-    print(f"Total terms lancaster: {len(sorted_terms_lancaster)}")
-    total_tokens_porter = 0
-    for term in sorted_terms_porter:
-        total_tokens_porter += term["tf"]
-    total_tokens_lancaster = 0
-    for term in sorted_terms_lancaster:
-        total_tokens_lancaster += term["tf"]
-    print(f"Total tokens porter: {total_tokens_porter}")
-    print(f"Total tokens lancaster: {total_tokens_lancaster}")
-    print(f"Time porter: {time_porter}")
-    print(f"Time lancaster: {time_lancaster}")
+    for method, terms_data in data.items():
+        print(f"Total terms {method}: {len(terms_data)}")
+    for method, terms_data in data.items():
+        total_tokens = 0
+        for term in terms_data:
+            total_tokens += term["tf"]
+        print(f"Total tokens {method}: {total_tokens}")
+    print(f"Time parsing: {parse_time}")
+    for method, (stemming_time, hit_rate) in stemming_times.items():
+        print(f"Time {method}: {stemming_time} (stem cache hits: {hit_rate:.2%})")
 
 def main():
-    data_porter = []
-    data_lancaster = []
+    # python punto5.py [--workers N] [--stemmers porter,lancaster,snowball] [--stem-cache directorio]
+    args, workers = parse_workers(sys.argv)
+    args, stemmers = pop_option(args, "--stemmers")
+    _, stem_cache_dir = pop_option(args, "--stem-cache")
+    stemming_methods = stemmers.split(",") if stemmers else ["porter", "lancaster"]
     url = "vaswani/corpus/doc-text.trec"
-    stemming_method = "porter"
-    inicio = time.perf_counter()
-    data_porter = parse_trec_file(url, stemming_method)
-    fin = time.perf_counter()
-    time_porter = fin - inicio
-    
-    stemming_method = "lancaster"
-    inicio = time.perf_counter()
-    data_lancaster = parse_trec_file(url, stemming_method)
-    fin = time.perf_counter()
-    time_lancaster = fin - inicio
-
-    accounting(data_porter, data_lancaster, time_porter, time_lancaster)
+    data, parse_time, stemming_times = compare_stemmers(url, stemming_methods, workers, stem_cache_dir)
+    accounting(data, parse_time, stemming_times)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
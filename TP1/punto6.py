@@ -1,136 +1,32 @@
-import pandas as pd
-import numpy as np
 import os
-import re
 import sys
-import unicodedata
-import json
-import time
-from sklearn.metrics import confusion_matrix
 from langdetect import detect
+from LanguageIdentifier import LanguageIdentifier, load_or_train_profiles
+from NaiveBayes import NaiveBayes
+from parallel import parse_workers, pop_option
 
-def remove_accents(text):
-    replacement = str.maketrans("áéíóúüÁÉÍÓÚÜ", "aeiouuAEIOUU")
-    if isinstance(text, list):  # Si es una lista, procesar cada palabra
-        return [word.translate(replacement) for word in text]
-    elif isinstance(text, str):  # Si es una cadena, procesarla directamente
-        return text.translate(replacement)
-    else:
-        raise TypeError("El argumento debe ser una lista o una cadena.")
+def training_method(url: str, profiles_dir: str = None) -> dict:
+    # perfiles de unigramas, bigramas y trigramas en una pasada; si hay perfiles guardados no reentrena
+    profiles_path = os.path.join(profiles_dir, "profiles.npz") if profiles_dir else None
+    return load_or_train_profiles(url, profiles_path, orders=(1, 2, 3))
 
-def training_first_method(url):
-    data = {}
-    documents = ["English", "French", "Italian"]
-    for doc in documents:
-        url_doc = url+doc
-        data[doc] = {}
-        with open(url_doc, 'r', encoding='ISO-8859-1') as file:
-            for line in file:
-                line = line.strip()
-                line = line.lower()
-                chars = remove_accents(line)
-                chars = re.sub(r'\W', '', chars) # quito caracteres especiales
-                chars = re.sub(r'\d', '', chars) # quito numeros
-                for char in chars:
-                    data[doc][char] = data[doc].get(char, 0) + 1
-    
-    return data
+def test_method(identifier: LanguageIdentifier, url_test: str) -> list:
+    # las líneas sin n-gramas del orden del perfil quedan como "Unknown", igual que en langdetect
+    return [(line, language or "Unknown", score) for line, language, score in identifier.classify_file(url_test)]
 
-def training_second_method(url):
-    data = {}
-    documents = ["English", "French", "Italian"]
-    for doc in documents:
-        url_doc = url+doc
-        data[doc] = {}
-        with open(url_doc, 'r', encoding='ISO-8859-1') as file:
-            for line in file:
-                line = line.strip()
-                line = line.lower()
-                chars = remove_accents(line)
-                chars = re.sub(r'\W', '', chars)
-                chars = re.sub(r'\d', '', chars)
-                for i in range(len(chars)-1):
-                    char1, char2 = line[i], line[i + 1]
-                    bigram = char1 + char2
-                    data[doc][bigram] = data[doc].get(bigram, 0) + 1
+def test_naive_bayes_method(url: str, url_test: str, profiles_dir: str = None, workers: int = 1) -> list:
+    # n-gramas de 1 a 5 caracteres con hashing, clasificando por bloques en workers procesos
+    model_path = os.path.join(profiles_dir, "naive_bayes.npz") if profiles_dir else None
+    model = NaiveBayes.load_or_train(url, model_path)
+    return list(model.classify_file(url_test, workers))
 
-    return data
+LANGDETECT_LANGUAGES = {"en": "English", "fr": "French", "it": "Italian"}
 
-def test_first_method(training_data, url_test):
-    results = []
-    documents = ["English", "French", "Italian"]
-    with open(url_test, 'r', encoding='ISO-8859-1') as file:
-        for line in file:
-            line = line.strip()
-            line = line.lower()
-            chars = remove_accents(line)
-            chars = re.sub(r'\W', '', chars)
-            chars = re.sub(r'\d', '', chars)
-
-            test_data = {}
-            for char in chars:
-                test_data[char] = test_data.get(char, 0) + 1
-            
-            best_lang = None
-            best_score = -1
-
-            for lang in documents:
-                train_data = training_data.get(lang, {})
-                all_chars = set(test_data.keys()).union(set(train_data.keys()))
-
-                test_vector = np.array([test_data.get(c, 0) for c in all_chars])
-                train_vector = np.array([train_data.get(c, 0) for c in all_chars])
-
-                if len(test_vector) > 1:  
-                    correlation = np.corrcoef(test_vector, train_vector)[0, 1]
-                else:
-                    correlation = 0
-                
-                if correlation > best_score:
-                    best_score = correlation
-                    best_lang = lang
-            
-            results.append((line, best_lang, best_score))
-    return results
-
-def test_second_method(training_data, url_test):
-    results = []
-    documents = ["English", "French", "Italian"]
-    with open(url_test, 'r', encoding='ISO-8859-1') as file:
-        for line in file:
-            line = line.strip()
-            line = line.lower()
-            chars = remove_accents(line)
-            chars = re.sub(r'\W', '', chars)
-            chars = re.sub(r'\d', '', chars)
-
-            test_data = {}
-            for i in range(len(chars)-1):
-                char1, char2 = line[i], line[i + 1]
-                bigram = char1 + char2
-                test_data[bigram] = test_data.get(bigram, 0) + 1
-            
-            best_lang = None
-            best_score = -1
-
-            for lang in documents:
-                train_data = training_data.get(lang, {})
-                all_chars = set(test_data.keys()).union(set(train_data.keys()))
-
-                test_vector = np.array([test_data.get(c, 0) for c in all_chars])
-                train_vector = np.array([train_data.get(c, 0) for c in all_chars])
-
-                if len(test_vector) > 1:  
-                    correlation = np.corrcoef(test_vector, train_vector)[0, 1]
-                else:
-                    correlation = 0
-                
-                if correlation > best_score:
-                    best_score = correlation
-                    best_lang = lang
-            
-            results.append((line, best_lang, best_score))
-    return results
+def detect_language(line: str) -> str:
+    try:
+        return LANGDETECT_LANGUAGES.get(detect(line), "Unknown")
+    except:
+        return "Unknown"
 
 def test_langdetect_method(url_test):
     results = []
@@ -138,27 +34,13 @@ def test_langdetect_method(url_test):
         for line in file:
             line = line.strip()
             line = line.lower()
-            chars = remove_accents(line)
-            chars = re.sub(r'\W', '', chars)
-            chars = re.sub(r'\d', '', chars)
-            
-            try:
-                detected_lang = detect(line)
-                if detected_lang == "en":
-                    best_lang = "English"
-                elif detected_lang == "fr":
-                    best_lang = "French"
-                elif detected_lang == "it":
-                    best_lang = "Italian"
-                else:
-                    best_lang = "Unknown"
-            except:
-                best_lang = "Unknown"
-            
-            results.append((line, best_lang))
+            results.append((line, detect_language(line)))
     return results
 
 def comparing_with_solution(results: list, url_solution: str):
+    # pandas y sklearn tardan en importarse más que el resto del script
+    import pandas as pd
+    from sklearn.metrics import confusion_matrix
     documentos = ["English", "French", "Italian"]
     with open(url_solution, 'r', encoding='ISO-8859-1') as file:
         true_labels = [line.strip().split(" ", 1)[1] for line in file]
@@ -174,19 +56,29 @@ def main():
     url_test = "languageIdentificationData/test"
     url_solution = "languageIdentificationData/solution"
 
-    training_data_first_method = training_first_method(url)
-    training_data_second_method = training_second_method(url)
-    results_first_method = test_first_method(training_data_first_method, url_test)
-    results_second_method = test_second_method(training_data_second_method, url_test)
+    # python punto6.py [--profiles directorio] [--workers N]
+    args, workers = parse_workers(sys.argv)
+    _, profiles_dir = pop_option(args, "--profiles")
+    identifiers = training_method(url, profiles_dir)
+    results_first_method = test_method(identifiers[1], url_test)
+    results_second_method = test_method(identifiers[2], url_test)
+    results_trigrams = test_method(identifiers[3], url_test)
+    results_naive_bayes = test_naive_bayes_method(url, url_test, profiles_dir, workers)
     results_langdetect = test_langdetect_method(url_test)
 
     cm_first = comparing_with_solution(results_first_method, url_solution)
     cm_second = comparing_with_solution(results_second_method, url_solution)
+    cm_trigrams = comparing_with_solution(results_trigrams, url_solution)
+    cm_naive_bayes = comparing_with_solution(results_naive_bayes, url_solution)
     cm_langdetect = comparing_with_solution(results_langdetect, url_solution)
     print("First solution: ")
     print(cm_first)
     print("Second solution: ")
     print(cm_second)
+    print("Trigrams solution: ")
+    print(cm_trigrams)
+    print("Naive Bayes solution: ")
+    print(cm_naive_bayes)
     print("LangDetect solution: ")
     print(cm_langdetect)
 
@@ -3,6 +3,7 @@ import matplotlib.pyplot as plt
 import collections
 import re
 from punto5 import Tokenizer
+from Vocabulary import Vocabulary
 
 def terms(data: list) -> dict:
     data.sort()
@@ -20,24 +21,11 @@ def terms(data: list) -> dict:
 
     if last_word != "":
         unique.append({"term": last_word, "tf": count})
-        return unique
+    return unique
 
 
-def term_in_data(data: list, term: str) -> bool:
-    for element in data:
-        if element["term"] == term:
-            return True
-    return False
-
-def set_term(data: list, term: str, tf: int) -> list:
-    for element in data:
-        if element["term"] == term:
-            element["df"] += 1
-            element["tf"] += tf
-            return data
-
 def read_file(url):
-    data = []
+    vocabulary = Vocabulary(keep_docs=False)
     tokenizer = Tokenizer(words=True, names=True, abbreviations=True, numbers=True)
     with open(url, "r", encoding="utf-8") as file:
         for line in file:
@@ -46,27 +34,12 @@ def read_file(url):
                 continue
             tokens = tokenizer.tokenize(line)
             terms_data = terms(tokens)
-            for term in terms_data:
-                if not term_in_data(data,term["term"]):
-                    data.append({
-                        "term": term["term"],
-                        "df": 1,
-                        "tf": term["tf"]
-                    })
-                else:
-                    set_term(data, term["term"], term["tf"])
-    return data
+            vocabulary.add_document(None, terms_data)
+    return vocabulary.data()
 
-def zipf_analysis(data):
-    data.sort(key=lambda x: x["tf"], reverse=True)
-    ranks = np.arange(1, len(data) + 1)
-    freqs = np.array([entry["tf"] for entry in data])
-    
-    # Ajuste con Zipf usando regresión lineal en escala logarítmica
-    log_ranks = np.log(ranks)
-    log_freqs = np.log(freqs)
-    coeffs = np.polyfit(log_ranks, log_freqs, 1)  # Ajuste lineal en log-log
-    predicted_log_freqs = np.polyval(coeffs, log_ranks)
+def plot_zipf(ranks, freqs, coeffs, output_file: str = None):
+    # con output_file guarda el gráfico en lugar de mostrarlo
+    predicted_log_freqs = np.polyval(coeffs, np.log(ranks))
     
     # Gráfico en escala lineal
     plt.figure(figsize=(12, 5))
@@ -87,8 +60,23 @@ def zipf_analysis(data):
     plt.legend()
     
     plt.tight_layout()
-    plt.show()
+    if output_file:
+        plt.savefig(output_file)
+        plt.close()
+    else:
+        plt.show()
+
+def zipf_analysis(data):
+    data.sort(key=lambda x: x["tf"], reverse=True)
+    ranks = np.arange(1, len(data) + 1)
+    freqs = np.array([entry["tf"] for entry in data])
     
+    # Ajuste con Zipf usando regresión lineal en escala logarítmica
+    log_ranks = np.log(ranks)
+    log_freqs = np.log(freqs)
+    coeffs = np.polyfit(log_ranks, log_freqs, 1)  # Ajuste lineal en log-log
+    plot_zipf(ranks, freqs, coeffs)
+
     # Mostrar coeficiente de ajuste
     print(f"Coeficiente alfa de la Ley de Zipf: {coeffs[0]:.2f}")
     print(f"Coeficiente C de la Ley de Zipf: {np.exp(coeffs[1]):.2f}")
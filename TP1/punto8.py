@@ -1,10 +1,13 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import collections
-import re
 from punto5 import Tokenizer
-import nltk
-from nltk.corpus import stopwords
+from Vocabulary import Vocabulary
+from Sketches import CountMin, HyperLogLog, SpaceSaving
+from parallel import pop_option
+import sys
+import csv
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'TP4', 'utils')))
+from Tokenizer import StopwordFilter
 
 def terms(data: list) -> dict:
     data.sort()
@@ -22,24 +25,11 @@ def terms(data: list) -> dict:
 
     if last_word != "":
         unique.append({"term": last_word, "tf": count})
-        return unique
+    return unique
 
 
-def term_in_data(data: list, term: str) -> bool:
-    for element in data:
-        if element["term"] == term:
-            return True
-    return False
-
-def set_term(data: list, term: str, tf: int) -> list:
-    for element in data:
-        if element["term"] == term:
-            element["df"] += 1
-            element["tf"] += tf
-            return data
-
 def read_file(url):
-    data = []
+    vocabulary = Vocabulary(keep_docs=False)
     tokenizer = Tokenizer(words=True, names=True, abbreviations=True, numbers=True)
     with open(url, "r", encoding="utf-8") as file:
         for line in file:
@@ -48,120 +38,174 @@ def read_file(url):
                 continue
             tokens = tokenizer.tokenize(line)
             terms_data = terms(tokens)
-            for term in terms_data:
-                if not term_in_data(data,term["term"]):
-                    data.append({
-                        "term": term["term"],
-                        "df": 1,
-                        "tf": term["tf"]
-                    })
-                else:
-                    set_term(data, term["term"], term["tf"])
-    return data
-
-def stopwords_analysis(data):
-    data.sort(key=lambda x: x["tf"], reverse=True)
-    n_terms = len(data)
-
-    # podo el 10, 20 y 30% de los datos mas frecuentes
-    pruned_data_10pct = data[int(n_terms*0.1):]
-    pruned_data_20pct = data[int(n_terms*0.2):]
-    pruned_data_30pct = data[int(n_terms*0.3):]
-
-    nltk.download('stopwords')
-    stop_words = set(stopwords.words('spanish'))
-
-    # verifico la cantidad de palabras podadas que son stopwords
-    # y guardo aquellas que no lo son
-    data_10pct = set([term["term"] for term in data]) - set([term["term"] for term in pruned_data_10pct])
-    data_20pct = set([term["term"] for term in data]) - set([term["term"] for term in pruned_data_20pct])
-    data_30pct = set([term["term"] for term in data]) - set([term["term"] for term in pruned_data_30pct])
-    
-    total_stopwords_10pct = 0
-    non_stopwords_terms_10pct = []
-    for term in data_10pct:
-        if term in stop_words:
-            total_stopwords_10pct+=1
-        else:
-            non_stopwords_terms_10pct.append(term)
-    
-    total_stopwords_20pct = 0
-    non_stopwords_terms_20pct = []
-    for term in data_20pct:
-        if term in stop_words:
-            total_stopwords_20pct+=1
-        else:
-            non_stopwords_terms_20pct.append(term)
-    
-    total_stopwords_30pct = 0
-    non_stopwords_terms_30pct = []
-    for term in data_30pct:
-        if term in stop_words:
-            total_stopwords_30pct+=1
-        else:
-            non_stopwords_terms_30pct.append(term)
-    
-    print(f"Poda de palabras mas frecuentes: ")
-    print(f"Porcentaje de terminos podados que eran stopwords (10%): {(total_stopwords_10pct / len(data_10pct)):.2f}")
-    print(f"Porcentaje de terminos podados que eran stopwords (20%): {(total_stopwords_20pct / len(data_20pct)):.2f}")
-    print(f"Porcentaje de terminos podados que eran stopwords (30%): {(total_stopwords_30pct / len(data_30pct)):.2f}")
-
-    with open("punto8_terminos_podados_10pct.txt", "w", encoding="utf-8") as file:
-        file.write("\n".join(non_stopwords_terms_10pct))
-    with open("punto8_terminos_podados_20pct.txt", "w", encoding="utf-8") as file:
-        file.write("\n".join(non_stopwords_terms_20pct))
-    with open("punto8_terminos_podados_30pct.txt", "w", encoding="utf-8") as file:
-        file.write("\n".join(non_stopwords_terms_30pct))
-
-
-def zipf_analysis(data):
+            vocabulary.add_document(None, terms_data)
+    return vocabulary.data()
+
+def read_file_sketch(url, capacity: int = 10000, epsilon: float = 0.0001):
+    """
+    Lee el archivo en una pasada con memoria fija: Space-Saving guarda los capacity términos
+    más frecuentes, Count-Min acota la frecuencia de cualquier término y HyperLogLog estima
+    el tamaño del vocabulario. La frecuencia de cada término es la menor de las dos
+    sobreestimaciones. Devuelve (data, cantidad de términos, cota del error de las frecuencias,
+    rangos cubiertos, tokens del texto). Los rangos cubiertos son los términos que Space-Saving
+    garantiza entre los más frecuentes (su cuenta menos su error supera la cota del error).
+    """
+    heavy_hitters = SpaceSaving(capacity)
+    frequencies = CountMin(epsilon)
+    vocabulary = HyperLogLog(0.01)
+    tokenizer = Tokenizer(words=True, names=True, abbreviations=True, numbers=True)
+    with open(url, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            for term in terms(tokenizer.tokenize(line)):
+                heavy_hitters.add(term["term"], term["tf"])
+                frequencies.add(term["term"], term["tf"])
+                vocabulary.add(term["term"])
+
+    top = heavy_hitters.top()
+    data = [{"term": term, "tf": min(count, frequencies.estimate(term))} for term, count, _ in top]
+    error = min(heavy_hitters.max_error(), frequencies.error_bound())
+    covered = sum(1 for _, count, term_error in top if count - term_error > heavy_hitters.max_error())
+    print(f"Sketch: {len(data)} términos más frecuentes de ~{len(vocabulary)} (±{vocabulary.relative_error():.0%}), "
+          f"error de las frecuencias <= {error:.0f} tokens (Space-Saving: {heavy_hitters.max_error()}, "
+          f"Count-Min: {frequencies.error_bound():.0f} con probabilidad {1 - frequencies.delta:.0%}), "
+          f"{covered} rangos garantizados de {heavy_hitters.total} tokens")
+    return data, max(len(vocabulary), len(data)), error, covered, heavy_hitters.total
+
+def spanish_stopwords() -> StopwordFilter:
+    # lista de NLTK instalada localmente, o la copia que se guardó la última vez (sin descargar)
+    return StopwordFilter.from_nltk("spanish", "stopwords_nltk_spanish.txt")
+
+def zipf_fit(data) -> tuple:
+    """Ordena data por tf y ajusta Zipf en escala log-log. Devuelve (alfa, c)."""
     data.sort(key=lambda x: x["tf"], reverse=True)
     ranks = np.arange(1, len(data) + 1)
     freqs = np.array([entry["tf"] for entry in data])
-    
+
     # Ajuste con Zipf usando regresión lineal en escala logarítmica
-    log_ranks = np.log(ranks)
-    log_freqs = np.log(freqs)
-    coeffs = np.polyfit(log_ranks, log_freqs, 1)  # Ajuste lineal en log-log
-    
-    alfa = coeffs[0]
-    c = np.exp(coeffs[1])
-    
-    n_terms = len(data)
-
-    n_tokens_10pct = 0
-    n_tokens_20pct = 0
-    n_tokens_30pct = 0
-    for i in range(1, int(n_terms * 0.1) + 1):
-        n_tokens_10pct += c * i ** alfa
-    for i in range(1, int(n_terms * 0.2) + 1):
-        n_tokens_20pct += c * i ** alfa
-    for i in range(1, int(n_terms * 0.3) + 1):
-        n_tokens_30pct += c * i ** alfa
-
-    # frecuencias reales
-    n_tokens_10pct_real = 0
-    n_tokens_20pct_real = 0
-    n_tokens_30pct_real = 0
-    for i in range(1, int(n_terms * 0.1) + 1):
-        n_tokens_10pct_real += freqs[i]
-    for i in range(1, int(n_terms * 0.2) + 1):
-        n_tokens_20pct_real += freqs[i]
-    for i in range(1, int(n_terms * 0.3) + 1):
-        n_tokens_30pct_real += freqs[i]
-
-    print(f"Cantidad de palabras calculadas en el 10% del vocabulario: {n_tokens_10pct}")
-    print(f"Cantidad de palabras calculadas en el 20% del vocabulario: {n_tokens_20pct}")
-    print(f"Cantidad de palabras calculadas en el 30% del vocabulario: {n_tokens_30pct}")
-    print(f"Cantidad de palabras reales en el 10% del vocabulario: {n_tokens_10pct_real}")
-    print(f"Cantidad de palabras reales en el 20% del vocabulario: {n_tokens_20pct_real}")
-    print(f"Cantidad de palabras reales en el 30% del vocabulario: {n_tokens_30pct_real}")
+    coeffs = np.polyfit(np.log(ranks), np.log(freqs), 1)
+    return coeffs[0], np.exp(coeffs[1])
+
+def pruning_analysis(data, percentiles, stop_words: set, n_terms: int = None, covered: int = None,
+                     total_tokens: int = None) -> dict:
+    """
+    Poda del percentil p de los términos más frecuentes para todos los percentiles a la vez,
+    con sumas acumuladas sobre el ranking: tokens que predice Zipf, tokens reales y
+    proporción de stopwords entre los términos podados. Con n_terms (vocabulario estimado)
+    data puede ser solo la cabeza del ranking y los cortes reales se truncan a ella.
+    Zipf se ajusta solo sobre los covered primeros rangos (los confiables de la cabeza); los
+    cortes que los superan son extrapolaciones, que se acotan a total_tokens y se informan
+    con el error relativo del ajuste en los rangos cubiertos.
+    """
+    data.sort(key=lambda x: x["tf"], reverse=True)
+    covered = min(covered or len(data), len(data))
+    alfa, c = zipf_fit(data[:covered])
+    n_terms = n_terms or len(data)
+    percentiles = np.asarray(percentiles, dtype=np.float64)
+    cuts = (n_terms * (percentiles / 100)).astype(np.int64)
+
+    ranks = np.arange(1, max(cuts.max(initial=0), 1) + 1)
+    predicted = np.concatenate(([0.0], np.cumsum(c * ranks ** alfa)))
+    freqs = np.array([entry["tf"] for entry in data], dtype=np.int64)
+    real = np.concatenate(([0], np.cumsum(freqs)))
+    is_stopword = np.array([entry["term"] in stop_words for entry in data], dtype=np.int64)
+    pruned_stopwords = np.concatenate(([0], np.cumsum(is_stopword)))
+
+    known_cuts = np.minimum(cuts, len(data))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stopword_ratio = pruned_stopwords[known_cuts] / known_cuts
+    predicted_tokens = predicted[cuts]
+    if total_tokens is not None:
+        predicted_tokens = np.minimum(predicted_tokens, total_tokens)
+    # error de la suma de Zipf contra la real en el último rango cubierto
+    covered_predicted = c * np.sum(np.arange(1, covered + 1) ** alfa)
+    return {
+        "percentiles": percentiles,
+        "cuts": cuts,
+        "known_cuts": known_cuts,
+        "covered": covered,
+        "extrapolated": cuts > covered,
+        "fit_error": abs(covered_predicted - real[covered]) / real[covered] if real[covered] else 0.0,
+        "total_tokens": total_tokens,
+        "predicted_tokens": predicted_tokens,
+        "real_tokens": real[known_cuts],
+        "pruned_stopwords": pruned_stopwords[known_cuts],
+        "stopword_ratio": stopword_ratio,
+        "alfa": alfa,
+        "c": c,
+    }
+
+def write_pruning_curves(analysis: dict, output_file: str) -> None:
+    with open(output_file, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["percentil", "terminos_podados", "tokens_zipf", "tokens_reales", "stopwords_podadas", "proporcion_stopwords"])
+        writer.writerows(zip(analysis["percentiles"].tolist(), analysis["cuts"].tolist(), analysis["predicted_tokens"].tolist(),
+                             analysis["real_tokens"].tolist(), analysis["pruned_stopwords"].tolist(), analysis["stopword_ratio"].tolist()))
+
+def stopwords_analysis(data, analysis: dict, stop_words: set):
+    # data ya está ordenado por tf (pruning_analysis)
+    if (analysis["known_cuts"] < analysis["cuts"]).any():
+        print(f"Solo se conocen los {len(data)} términos más frecuentes: los cortes mayores se truncan.")
+    # los términos podados que no son stopwords de cada corte son un prefijo de la misma lista,
+    # que se arma una sola vez para el corte mayor
+    max_cut = int(analysis["known_cuts"].max(initial=0))
+    non_stopwords_terms = [entry["term"] for entry in data[:max_cut] if entry["term"] not in stop_words]
+    print(f"Poda de palabras mas frecuentes: ")
+    for percentile, ratio, cut, pruned_stopwords in zip(analysis["percentiles"].tolist(), analysis["stopword_ratio"].tolist(),
+                                                        analysis["known_cuts"].tolist(), analysis["pruned_stopwords"].tolist()):
+        print(f"Porcentaje de terminos podados que eran stopwords ({percentile:g}%): {ratio:.2f}")
+        # guardo los términos podados que no son stopwords
+        with open(f"punto8_terminos_podados_{percentile:g}pct.txt", "w", encoding="utf-8") as file:
+            file.write("\n".join(non_stopwords_terms[:cut - pruned_stopwords]))
+
+def zipf_analysis(analysis: dict):
+    for percentile, tokens, extrapolated in zip(analysis["percentiles"].tolist(), analysis["predicted_tokens"].tolist(),
+                                                analysis["extrapolated"].tolist()):
+        note = ""
+        if extrapolated:
+            # fuera de los rangos cubiertos la predicción es una extrapolación del ajuste
+            note = f" (extrapolado más allá de los {analysis['covered']} términos cubiertos, error del ajuste en ellos: ±{analysis['fit_error']:.0%}"
+            if tokens == analysis["total_tokens"]:
+                note += f", acotado a los {analysis['total_tokens']} tokens del texto"
+            note += ")"
+        print(f"Cantidad de palabras calculadas en el {percentile:g}% del vocabulario: {tokens}{note}")
+    for percentile, tokens in zip(analysis["percentiles"].tolist(), analysis["real_tokens"].tolist()):
+        print(f"Cantidad de palabras reales en el {percentile:g}% del vocabulario: {tokens}")
 
 def main():
+    # python punto8.py [--sketch cantidad_de_terminos_frecuentes] [--percentiles 10,20,30 | --sweep] [--curves archivo.csv]
+    # --sweep evalúa los cortes del 1% al 50% y solo escribe las curvas (por defecto en punto8_curvas_poda.csv),
+    # sin un archivo de términos podados por corte
+    args, capacity = pop_option(sys.argv, "--sketch")
+    args, percentiles = pop_option(args, "--percentiles")
+    _, curves_file = pop_option(args, "--curves")
+    sweep = "--sweep" in args
+    if sweep:
+        percentiles = list(range(1, 51))
+        curves_file = curves_file or "punto8_curvas_poda.csv"
+    else:
+        percentiles = [float(p) for p in percentiles.split(",")] if percentiles else [10, 20, 30]
+
+    # la lista de stopwords se carga antes de recorrer el texto: si no está, falla sin haber leído nada
+    stop_words = spanish_stopwords()
     url = "pg2000.txt"
-    data = read_file(url)
-    zipf_analysis(data)
-    stopwords_analysis(data)
+    if capacity:
+        data, n_terms, _, covered, total_tokens = read_file_sketch(url, int(capacity))
+    else:
+        data = read_file(url)
+        n_terms = len(data)
+        covered = total_tokens = None
+    analysis = pruning_analysis(data, percentiles, stop_words, n_terms, covered, total_tokens)
+    if sweep:
+        print(f"Zipf: alfa = {analysis['alfa']:.4f}, c = {analysis['c']:.2f}. "
+              f"Curvas de poda de {len(percentiles)} percentiles en {curves_file}")
+    else:
+        zipf_analysis(analysis)
+        stopwords_analysis(data, analysis, stop_words)
+    if curves_file:
+        write_pruning_curves(analysis, curves_file)
 
 if __name__ == "__main__":
     main()
@@ -3,6 +3,8 @@ import numpy as np
 import csv
 from punto5 import Tokenizer
 import sys
+from Sketches import HyperLogLog
+from parallel import pop_option
 
 def terms(data: list) -> dict:
     data.sort()
@@ -22,13 +24,28 @@ def terms(data: list) -> dict:
         unique.append({"term": last_word, "tf": count})
     return unique
 
-def read_file(url):
-    data = []
+def heaps_checkpoints(growth, checkpoints_per_decade: int):
+    """
+    Filtra los pares (términos procesados, términos únicos) en puntos espaciados
+    logarítmicamente, más el último. Los únicos pueden ser cualquier objeto con len(),
+    que solo se calcula en los puntos guardados.
+    """
+    step = 10 ** (1 / checkpoints_per_decade)
+    next_checkpoint = 1
+    terms_processed, recorded = 0, 0
+    for terms_processed, unique_terms in growth:
+        if terms_processed >= next_checkpoint:
+            recorded = terms_processed
+            yield terms_processed, len(unique_terms)
+            while next_checkpoint <= terms_processed:
+                next_checkpoint *= step
+    if terms_processed != recorded:
+        yield terms_processed, len(unique_terms)
+
+def read_growth(url, unique_terms):
+    # genera (términos procesados, unique_terms) después de cada línea no vacía
     tokenizer = Tokenizer(words=True, names=True, abbreviations=True, numbers=True)
     terms_processed = 0
-    unique_terms = set()
-    output_data = []
-
     with open(url, "r", encoding="utf-8") as file:
         for line in file:
             line = line.strip()
@@ -39,9 +56,23 @@ def read_file(url):
             terms_processed += len(tokens)
             for term in terms_data:
                 unique_terms.add(term["term"])
-            output_data.append((terms_processed, len(unique_terms)))
-    
-    return output_data
+            yield terms_processed, unique_terms
+
+def read_file(url, checkpoints_per_decade: int = None, error: float = None):
+    """
+    Devuelve los pares (términos procesados, términos únicos) del archivo. Sin opciones
+    guarda un par por línea; con checkpoints_per_decade solo en puntos espaciados
+    logarítmicamente (y al final), y con error cuenta los únicos con un HyperLogLog de
+    ese error relativo en lugar de un set, así la memoria no crece con el corpus. La estimación
+    del HyperLogLog recorre todos sus registros, así que con error se usan siempre puntos
+    espaciados (10 por década si no se indica otra cantidad).
+    """
+    growth = read_growth(url, HyperLogLog(error) if error else set())
+    if error and not checkpoints_per_decade:
+        checkpoints_per_decade = 10
+    if checkpoints_per_decade:
+        return list(heaps_checkpoints(growth, checkpoints_per_decade))
+    return [(terms_processed, len(unique_terms)) for terms_processed, unique_terms in growth]
 
 def write_output(output_data, output_file):
     with open(output_file, "w", newline="") as file:
@@ -49,6 +80,7 @@ def write_output(output_data, output_file):
         writer.writerows(output_data)
 
 def heaps_law_fit(output_data):
+    # con la serie por puntos logarítmicos cada década pesa lo mismo en el ajuste
     N = np.array([x[0] for x in output_data])
     V = np.array([x[1] for x in output_data])
     log_N = np.log(N)
@@ -57,7 +89,7 @@ def heaps_law_fit(output_data):
     k = np.exp(log_k)
     return k, beta
 
-def plot_heaps_law(output_data, k, beta):
+def plot_heaps_law(output_data, k, beta, output_file: str = None):
     N = np.array([x[0] for x in output_data])
     V = np.array([x[1] for x in output_data])
     fitted_V = k * N ** beta
@@ -71,17 +103,23 @@ def plot_heaps_law(output_data, k, beta):
     plt.ylabel("# Términos Únicos")
     plt.legend()
     plt.title("Ley de Heaps")
-    plt.show()
+    if output_file:
+        plt.savefig(output_file)
+        plt.close()
+    else:
+        plt.show()
 
 def main():
-    if len(sys.argv) < 3:
-        print("Uso: python script.py <archivo_entrada> <archivo_salida>")
+    args, checkpoints = pop_option(sys.argv, "--checkpoints")
+    args, error = pop_option(args, "--hll")
+    if len(args) < 3:
+        print("Uso: python script.py <archivo_entrada> <archivo_salida> [--checkpoints puntos_por_decada] [--hll error_relativo]")
         return
-    
-    input_file = sys.argv[1]
-    output_file = sys.argv[2]
 
-    data = read_file(input_file)
+    input_file = args[1]
+    output_file = args[2]
+
+    data = read_file(input_file, int(checkpoints) if checkpoints else None, float(error) if error else None)
     write_output(data, output_file)
     k, beta = heaps_law_fit(data)
     print(f"Valores ajustados: k = {k}, beta = {beta}")
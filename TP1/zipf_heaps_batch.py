@@ -0,0 +1,114 @@
+import matplotlib
+matplotlib.use("Agg")  # sin ventanas: los gráficos solo se guardan en archivos
+import csv
+import json
+import os
+import sys
+import numpy as np
+from punto5 import Tokenizer
+from Vocabulary import Vocabulary
+from parallel import map_chunks, parse_workers, pop_option
+from punto7 import plot_zipf, terms
+from punto8 import zipf_fit
+from punto9 import heaps_checkpoints, heaps_law_fit, plot_heaps_law
+
+# Ajusta Zipf (alfa, C) y Heaps (k, beta) para muchos corpus en procesos paralelos y
+# guarda una fila por corpus en un CSV o JSON. Como en punto9, Heaps se ajusta con un punto
+# por línea, o con --checkpoints solo en puntos espaciados logarítmicamente.
+
+FIELDS = ["corpus", "tokens", "terms", "zipf_alfa", "zipf_c", "heaps_k", "heaps_beta"]
+
+def corpus_files(paths: list) -> list:
+    """Expande los directorios a sus archivos (ordenados); los archivos quedan como están."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                if os.path.isfile(os.path.join(path, name))))
+        else:
+            files.append(path)
+    return files
+
+def read_corpus(url, vocabulary: Vocabulary):
+    # genera (términos procesados, vocabulario) después de cada línea no vacía
+    tokenizer = Tokenizer(words=True, names=True, abbreviations=True, numbers=True)
+    terms_processed = 0
+    with open(url, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            tokens = tokenizer.tokenize(line)
+            vocabulary.add_document(None, terms(tokens))
+            terms_processed += len(tokens)
+            yield terms_processed, vocabulary
+
+def fit_corpus(url: str, plots_dir: str = None, checkpoints_per_decade: int = None, index: int = 0) -> dict:
+    """
+    Lee el corpus una vez y ajusta Zipf sobre las frecuencias y Heaps sobre el crecimiento del vocabulario.
+    Los gráficos llevan index (la posición del corpus en la lista) delante del nombre del archivo,
+    así no se pisan los de corpus con el mismo nombre en distintos directorios.
+    """
+    vocabulary = Vocabulary(keep_docs=False)
+    growth = read_corpus(url, vocabulary)
+    if checkpoints_per_decade:
+        growth = heaps_checkpoints(growth, checkpoints_per_decade)
+    else:
+        growth = ((terms_processed, len(unique_terms)) for terms_processed, unique_terms in growth)
+    heaps_data = [point for point in growth if point[1] > 0]
+    data = vocabulary.data()
+    row = {"corpus": url, "tokens": heaps_data[-1][0] if heaps_data else 0, "terms": len(data),
+           "zipf_alfa": None, "zipf_c": None, "heaps_k": None, "heaps_beta": None}
+    if len(data) < 2 or len(heaps_data) < 2:
+        return row  # no alcanza para ajustar una recta
+
+    alfa, c = zipf_fit(data)
+    k, beta = heaps_law_fit(heaps_data)
+    row.update(zipf_alfa=float(alfa), zipf_c=float(c), heaps_k=float(k), heaps_beta=float(beta))
+    if plots_dir:
+        name = f"{index:04d}_{os.path.splitext(os.path.basename(url))[0]}"
+        ranks = np.arange(1, len(data) + 1)
+        freqs = np.array([entry["tf"] for entry in data])
+        plot_zipf(ranks, freqs, (alfa, np.log(c)), os.path.join(plots_dir, f"{name}_zipf.png"))
+        plot_heaps_law(heaps_data, k, beta, os.path.join(plots_dir, f"{name}_heaps.png"))
+    return row
+
+def fit_corpora(chunk: list, plots_dir: str, checkpoints_per_decade: int) -> list:
+    # chunk tiene pares (posición, corpus)
+    return [fit_corpus(url, plots_dir, checkpoints_per_decade, index) for index, url in chunk]
+
+def write_results(rows: list, output_file: str) -> None:
+    if output_file.endswith(".json"):
+        with open(output_file, "w", encoding="utf-8") as file:
+            json.dump(rows, file, indent=2)
+        return
+    with open(output_file, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def main():
+    # python zipf_heaps_batch.py <corpus o directorio>... [--output resultados.csv|.json] [--plots directorio]
+    #                            [--checkpoints puntos_por_decada] [--workers N]
+    args, workers = parse_workers(sys.argv)
+    args, output_file = pop_option(args, "--output")
+    args, plots_dir = pop_option(args, "--plots")
+    args, checkpoints = pop_option(args, "--checkpoints")
+    files = corpus_files(args[1:])
+    if not files:
+        print("Uso: python zipf_heaps_batch.py <corpus o directorio>... [--output resultados.csv|.json] [--plots directorio] "
+              "[--checkpoints puntos_por_decada] [--workers N]")
+        return
+    if plots_dir:
+        os.makedirs(plots_dir, exist_ok=True)
+
+    rows = []
+    checkpoints = int(checkpoints) if checkpoints else None
+    for chunk_rows in map_chunks(fit_corpora, list(enumerate(files)), workers, plots_dir, checkpoints, chunk_size=1):
+        for row in chunk_rows:
+            rows.append(row)
+            print(f"{row['corpus']}: alfa={row['zipf_alfa']}, C={row['zipf_c']}, k={row['heaps_k']}, beta={row['heaps_beta']}")
+    write_results(rows, output_file or "zipf_heaps.csv")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 import os
 import sys
 import re
-from nltk.stem import PorterStemmer, LancasterStemmer, SnowballStemmer
-from Tokenizer import Tokenizer
 from Matrix import DynamicMatrix
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'TP4', 'utils')))
+from Tokenizer import Tokenizer
+from HtmlText import is_html
+from TokenCache import TokenCache
 import math
 
 def add_terms_to_matrix(matrix, terms, doc_name):
@@ -17,21 +19,32 @@ def add_terms_to_matrix(matrix, terms, doc_name):
 
 
 
-def term_frequency_matrix(path: str) -> DynamicMatrix:
+def read_documents(filepaths: list):
+    for filepath in filepaths:
+        with open(filepath, "r", encoding="utf-8", errors="ignore") as file:
+            yield file.read()
+
+def term_frequency_matrix(path: str, workers: int = 1, token_cache: str = None) -> DynamicMatrix:
     tokenizer = Tokenizer(words=True, names=True)
     data = DynamicMatrix()
 
     # Cambiar esto de ["terms"] a "terms"
     data.add_row("terms")  # Fila 0, clave "terms"
-    for root, _, filenames in os.walk(path):
-        for f in filenames:
-            if f.endswith(".txt") or f.endswith(".html"):
-                filepath = os.path.join(root, f)
-
-                with open(filepath, "r", encoding="utf-8", errors="ignore") as file:
-                    for line in file:
-                        terms = tokenizer.tokenize(line, html_tags=True)
-                        data = add_terms_to_matrix(data, terms, filepath)
+    filepaths = [os.path.join(root, f) for root, _, filenames in os.walk(path) for f in filenames
+                 if f.endswith(".txt") or f.endswith(".html")]
+    # cada archivo se tokeniza línea por línea, en workers procesos si workers > 1;
+    # de una colección HTML solo se tokenizan el título y el texto, sin marcas, scripts ni estilos
+    html = bool(filepaths) and all(is_html(filepath) for filepath in filepaths)
+    texts = read_documents(filepaths)
+    if token_cache:
+        # los tokens crudos se leen de la caché (o se guardan en ella la primera vez)
+        cache = TokenCache.load_or_build(token_cache, filepaths, texts, tokenizer, per_line=True, html=html)
+        documents = cache.documents(html_tags=True, tokenizer=tokenizer)
+    else:
+        documents = tokenizer.tokenize_many(texts, workers, per_line=True, html=html, html_tags=True)
+    for filepath, terms in zip(filepaths, documents):
+        if os.path.getsize(filepath) > 0:  # un archivo vacío no tiene líneas ni columna
+            data = add_terms_to_matrix(data, terms, filepath)
     return data
 
 def tf_idf(tf_matrix: DynamicMatrix) -> DynamicMatrix:
@@ -122,9 +135,9 @@ def search(tf_idf_matrix: DynamicMatrix, query: str) -> list:
     return sorted_results
 
 def main():
-    if len(sys.argv) != 3:
+    if len(sys.argv) not in (3, 4, 5):
         print("Uso:")
-        print("python punto2.py [directorio/de/documentos] [consulta]")
+        print("python punto2.py [directorio/de/documentos] [consulta] [workers] [directorio/de/cache/de/tokens]")
         sys.exit(1)
 
     if not os.path.isdir(sys.argv[1]):
@@ -134,7 +147,13 @@ def main():
     arg1 = sys.argv[1]
     arg2 = sys.argv[2]
 
-    tf_matrix = term_frequency_matrix(arg1)
+    if len(sys.argv) >= 4 and (not sys.argv[3].isdigit() or int(sys.argv[3]) <= 0):
+        print("El valor de workers debe ser un entero mayor que 0.")
+        sys.exit(1)
+    workers = int(sys.argv[3]) if len(sys.argv) >= 4 else 1
+    token_cache = sys.argv[4] if len(sys.argv) == 5 else None
+
+    tf_matrix = term_frequency_matrix(arg1, workers, token_cache)
 
     tf_idf_matrix = tf_idf(tf_matrix)
     
@@ -4,6 +4,8 @@ import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
 from Tokenizer import Tokenizer
+from HtmlText import is_html
+from TokenCache import TokenCache
 import pickle
 import logging
 from time import perf_counter
@@ -30,23 +32,19 @@ def setup_logger():
     logger.addHandler(fh)
     return logger
 
-def process_file(file, docid, tokenizer: Tokenizer, terms_to_id: dict, id_to_docs: dict) -> list[tuple]:
-    term_freq = {}
-    for line in file:
-        # Read the file line by line
-        if not line.strip():
-            continue
+def process_terms(term_freq: dict, docid, terms_to_id: dict, id_to_docs: dict) -> list[tuple]:
+    """
+    Assign term IDs and compute the document norm from the term frequencies of a document.
+    :param term_freq: Dictionary mapping each term to its frequency, in order of first occurrence.
+    :param docid: The document ID.
+    :param terms_to_id: Dictionary mapping terms to their IDs, updated in place.
+    :param id_to_docs: Dictionary mapping document IDs to [file name, norm], updated in place.
+    :return: The (term ID, document ID, frequency) tuples of the document and id_to_docs.
+    """
+    for term in term_freq:
+        if term not in terms_to_id:
+            terms_to_id[term] = len(terms_to_id) + 1
 
-        terms: list = tokenizer.tokenize(line, html_tags=True)
-        
-        for term in terms:
-            if term in term_freq:
-                term_freq[term] += 1
-            else:
-                term_freq[term] = 1
-            if term not in terms_to_id:
-                terms_to_id[term] = len(terms_to_id) + 1
-    
     norm = 0.0
     for term, freq in term_freq.items():
         norm += freq ** 2
@@ -113,9 +111,18 @@ def merge_chunks(terms_to_id: dict, chunk_number: int)-> dict:
     return vocabulary
 
 
-def bsbi(input_dir, chunk_limit):
+def read_documents(paths: list):
+    for file_path in paths:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            yield f.read()
+
+
+def bsbi(input_dir, chunk_limit, workers: int = 1, token_cache: str = None):
     """
     BSBI algorithm with improved logging and timing.
+    Documents are tokenized by tokenize_many, in worker processes when workers > 1.
+    HTML collections are converted to text (title and body) before tokenization.
+    With token_cache, the raw tokens are read from (or first written to) that TokenCache directory.
     """
     logger = setup_logger()
     logger.info("Starting BSBI algorithm...")
@@ -143,46 +150,50 @@ def bsbi(input_dir, chunk_limit):
     
     # Chunk generation phase
     logger.info("=== Chunk Generation Phase ===")
-    for root, _, files in os.walk(input_dir):
-        for file in files:
-            file_path = os.path.join(root, file)
-            total_docs += 1
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                doc_id = len(id_to_docs) + 1
-                id_to_docs[doc_id] = [file]
-                
-                # Process file and measure time
-                start_file = perf_counter()
-                terms_tuples, id_to_docs = process_file(f, doc_id, tokenizer, terms_to_id, id_to_docs)
-                file_time = perf_counter() - start_file
-                
-                chunk_docs += terms_tuples
-                docs_read_for_chunk += 1
-                total_terms += len(terms_tuples)
-                
-                # Log file processing (every 50 files for less verbosity)
-                if total_docs % 50 == 0:
-                    logger.debug(f"Processed {total_docs} files | Last file: {file} ({file_time:.4f}s) | "
-                                f"Current chunk size: {docs_read_for_chunk}/{chunk_limit}")
-                
-                # Process chunk when limit reached
-                if docs_read_for_chunk >= chunk_limit:
-                    start_chunk = perf_counter()
-                    process_chunk(chunk_docs, chunk_number)
-                    chunk_time = perf_counter() - start_chunk
-                    
-                    chunk_times.append(chunk_time)
-                    chunk_sizes.append(docs_read_for_chunk)
-                    
-                    logger.info(f"Chunk {chunk_number} completed - "
-                               f"Docs: {docs_read_for_chunk} | "
-                               f"Terms: {len(chunk_docs)} | "
-                               f"Time: {chunk_time:.4f}s")
-                    
-                    docs_read_for_chunk = 0
-                    chunk_number += 1
-                    chunk_docs = []
+    paths = [os.path.join(root, file) for root, _, files in os.walk(input_dir) for file in files]
+    html = bool(paths) and all(is_html(path) for path in paths)
+    logger.info(f"HTML collection: {html}")
+    if token_cache:
+        cache = TokenCache.load_or_build(token_cache, paths, read_documents(paths), tokenizer, per_line=True, html=html)
+        logger.info(f"Token cache: {token_cache} ({len(cache)} documents, {len(cache.surfaces)} raw tokens)")
+        documents = cache.documents(counts=True, html_tags=True, tokenizer=tokenizer)
+    else:
+        documents = tokenizer.tokenize_many(read_documents(paths), workers, counts=True, per_line=True, html=html, html_tags=True)
+    for file_path, term_freq in zip(paths, documents):
+        file = os.path.basename(file_path)
+        total_docs += 1
+
+        doc_id = len(id_to_docs) + 1
+        id_to_docs[doc_id] = [file]
+
+        terms_tuples, id_to_docs = process_terms(term_freq, doc_id, terms_to_id, id_to_docs)
+
+        chunk_docs += terms_tuples
+        docs_read_for_chunk += 1
+        total_terms += len(terms_tuples)
+
+        # Log file processing (every 50 files for less verbosity)
+        if total_docs % 50 == 0:
+            logger.debug(f"Processed {total_docs} files | Last file: {file} | "
+                        f"Current chunk size: {docs_read_for_chunk}/{chunk_limit}")
+
+        # Process chunk when limit reached
+        if docs_read_for_chunk >= chunk_limit:
+            start_chunk = perf_counter()
+            process_chunk(chunk_docs, chunk_number)
+            chunk_time = perf_counter() - start_chunk
+
+            chunk_times.append(chunk_time)
+            chunk_sizes.append(docs_read_for_chunk)
+
+            logger.info(f"Chunk {chunk_number} completed - "
+                       f"Docs: {docs_read_for_chunk} | "
+                       f"Terms: {len(chunk_docs)} | "
+                       f"Time: {chunk_time:.4f}s")
+
+            docs_read_for_chunk = 0
+            chunk_number += 1
+            chunk_docs = []
 
     # Process last chunk if any remaining
     if chunk_docs:
@@ -235,8 +246,8 @@ def bsbi(input_dir, chunk_limit):
 
 def main():
     args = os.sys.argv
-    if len(args) != 3:
-        print("Usage: python punto1.py <input_dir> <docs_read_for_chunk>")
+    if len(args) not in (3, 4, 5):
+        print("Usage: python punto1.py <input_dir> <docs_read_for_chunk> [workers] [token_cache_dir]")
         return
 
     input_dir = args[1]
@@ -248,7 +259,13 @@ def main():
         print(f"Error: {input_dir} is not a directory")
         return
     
-    bsbi(input_dir, docs_read_for_chunk)
+    # same rule as --workers in TP1: a positive integer
+    if len(args) >= 4 and (not args[3].isdigit() or int(args[3]) <= 0):
+        print("Error: workers must be an integer greater than 0")
+        return
+    workers = int(args[3]) if len(args) >= 4 else 1
+    token_cache = args[4] if len(args) == 5 else None
+    bsbi(input_dir, docs_read_for_chunk, workers, token_cache)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,3 @@
-import boolean
 import pickle
 import struct
 import os
@@ -81,6 +80,7 @@ def main():
 
     expression = args[1]
     
+    import boolean  # only once there is a query to parse, so the usage message is instant
     algebra = boolean.BooleanAlgebra()
 
     # Load the vocabulary
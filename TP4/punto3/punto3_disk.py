@@ -1,4 +1,3 @@
-import boolean
 import pickle
 import struct
 import os
@@ -82,6 +81,7 @@ def main():
 
     expression = args[1]
     
+    import boolean  # only once there is a query to parse, so the usage message is instant
     algebra = boolean.BooleanAlgebra()
 
     # Load the vocabulary
@@ -1,4 +1,3 @@
-import boolean
 import pickle
 import struct
 import os
@@ -100,6 +99,7 @@ def main():
     # start_time = perf_counter()
 
     expression = args[1]
+    import boolean  # only once there is a query to parse, so the usage message is instant
     algebra = boolean.BooleanAlgebra()
 
     # Cargar datos
@@ -3,6 +3,7 @@ import struct
 import os
 import sys
 import heapq
+from functools import lru_cache
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
 from Tokenizer import Tokenizer
 
@@ -101,6 +102,16 @@ def get_posting_list(term: str, vocabulary:dict) -> list[tuple]:
     return posting_list
 
 
+@lru_cache(maxsize=1)
+def query_tokenizer() -> Tokenizer:
+    """
+    The tokenizer of the queries, with the options of the BSBI indexer, built once per process.
+    :return: The shared Tokenizer.
+    """
+    return Tokenizer(names=True, dates=True, urls=True, emails=True,
+                     words=True, numbers=True, abbreviations=True)
+
+
 def parse_query(query: str, vocabulary: dict) -> dict:
     """
     Parse query into a vectorial expression.
@@ -108,9 +119,7 @@ def parse_query(query: str, vocabulary: dict) -> dict:
     :return: The parsed expression.
     """
     term_freq = {}
-    tokenizer = Tokenizer(names=True, dates=True, urls=True, emails=True, 
-                         words=True, numbers=True, abbreviations=True)
-    terms: list = tokenizer.tokenize(query, html_tags=True)
+    terms: list = query_tokenizer().tokenize(query, html_tags=True)
     for term in terms:
         if term not in vocabulary:
             continue
@@ -0,0 +1,72 @@
+from html.parser import HTMLParser
+
+HTML_EXTENSIONS = (".html", ".htm")
+SKIPPED_TAGS = {"script", "style", "noscript", "template"}
+# tags rendered inside a line: they do not separate the text around them
+INLINE_TAGS = {"a", "abbr", "b", "bdi", "bdo", "cite", "code", "data", "dfn", "em", "font", "i", "kbd", "mark",
+               "q", "s", "samp", "small", "span", "strong", "sub", "sup", "time", "tt", "u", "var", "wbr"}
+
+
+class HtmlText(HTMLParser):
+    """
+    Incremental HTML to text conversion. The markup can be fed in pieces of any size
+    (tags and entities split across pieces are handled by HTMLParser); tags, comments,
+    scripts and styles are dropped and block tags become line breaks. The title is kept
+    apart from the body.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title_parts = []
+        self.body_parts = []
+        self.skip_depth = 0
+        self.in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+        elif tag == "title":
+            self.in_title = True
+        elif tag not in INLINE_TAGS:
+            self.body_parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self.skip_depth = max(self.skip_depth - 1, 0)
+        elif tag == "title":
+            self.in_title = False
+        elif tag not in INLINE_TAGS:
+            self.body_parts.append("\n")
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        if self.in_title:
+            self.title_parts.append(data)
+        else:
+            self.body_parts.append(data)
+
+    @property
+    def title(self) -> str:
+        return " ".join("".join(self.title_parts).split())
+
+    def take_body(self) -> str:
+        """:return: The body text parsed since the last call, so it can be consumed as it streams."""
+        body = "".join(self.body_parts)
+        self.body_parts = []
+        return body
+
+
+def html_to_text(markup: str) -> tuple:
+    """
+    :param markup: An HTML document.
+    :return: (title, body text).
+    """
+    parser = HtmlText()
+    parser.feed(markup)
+    parser.close()
+    return parser.title, parser.take_body()
+
+
+def is_html(path: str) -> bool:
+    return path.lower().endswith(HTML_EXTENSIONS)
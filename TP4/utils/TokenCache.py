@@ -0,0 +1,191 @@
+import hashlib
+import inspect
+import json
+import os
+from array import array
+import numpy as np
+from HtmlText import INLINE_TAGS, SKIPPED_TAGS, HtmlText, html_to_text
+from Tokenizer import FOLD, StopwordFilter, Tokenizer, fold_accents
+
+
+class TokenCache:
+    """
+    Tokenized collection stored on disk: the raw tokens of every document (the pattern
+    matches, with their accents folded, before lowercasing, stopwords or stemming) as uint32 ids
+    into an interned lexicon of (kind, surface form) pairs. The token ids are memory-mapped,
+    so re-indexing with other normalization settings only maps them through an array
+    computed once per lexicon entry, instead of running the regex over the corpus again.
+    """
+    MANIFEST = "manifest.json"
+    LEXICON = "lexicon.json"
+    TOKENS = "tokens.u32"
+    OFFSETS = "offsets.u64"
+
+    def __init__(self, directory: str):
+        """
+        :param directory: Directory of a cache written by build.
+        """
+        self.directory = directory
+        with open(os.path.join(directory, self.MANIFEST), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        with open(os.path.join(directory, self.LEXICON), "r", encoding="utf-8") as f:
+            lexicon = json.load(f)
+        self.kinds = lexicon["kinds"]
+        self.surfaces = lexicon["surfaces"]
+        tokens_path = os.path.join(directory, self.TOKENS)
+        # numpy cannot map an empty file
+        if os.path.getsize(tokens_path) > 0:
+            self.tokens = np.memmap(tokens_path, dtype=np.uint32, mode="r")
+        else:
+            self.tokens = np.zeros(0, dtype=np.uint32)
+        self.offsets = np.fromfile(os.path.join(directory, self.OFFSETS), dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @staticmethod
+    def fingerprint(value: str) -> str:
+        """SHA-1 of a long setting, such as a translation table."""
+        return hashlib.sha1(value.encode("utf-8", "surrogatepass")).hexdigest()
+
+    @classmethod
+    def signature(cls, paths: list, tokenizer: Tokenizer, per_line: bool, html: bool) -> dict:
+        """
+        What the cached tokens depend on: the patterns, the accent folding table, how documents
+        are split, the HTML to text rules (tag sets and parser code) when html is set, and the files.
+        """
+        files = []
+        for path in paths:
+            stat = os.stat(path)
+            files.append([os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+        html_rules = None
+        if html:
+            html_rules = cls.fingerprint("\n".join([" ".join(sorted(SKIPPED_TAGS)), " ".join(sorted(INLINE_TAGS)),
+                                                     inspect.getsource(HtmlText)]))
+        return {"patterns": tokenizer.regex.pattern, "folding": cls.fingerprint(FOLD), "per_line": per_line,
+                "html": html, "html_rules": html_rules, "files": files}
+
+    @classmethod
+    def build(cls, directory: str, paths: list, texts, tokenizer: Tokenizer, per_line: bool = False, html: bool = False) -> "TokenCache":
+        """
+        Tokenize a collection once and write its raw tokens to directory.
+        :param directory: Directory of the cache, created if needed.
+        :param paths: Files of the collection, in document order.
+        :param texts: Iterable with the text of each file, as the caller reads them.
+        :param tokenizer: Tokenizer whose patterns find the tokens.
+        :param per_line: Tokenize each non-blank line on its own, like tokenize_text.
+        :param html: The documents are HTML: tokenize their title and body text only.
+        :return: The cache.
+        """
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, cls.MANIFEST)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)  # an interrupted build must not look valid
+        signature = cls.signature(paths, tokenizer, per_line, html)
+
+        ids = {}
+        kinds = []
+        surfaces = []
+        offsets = array('Q', [0])
+        with open(os.path.join(directory, cls.TOKENS), "wb") as tokens_file:
+            for text in texts:
+                if html:
+                    title, body = html_to_text(text)
+                    text = title + "\n" + body
+                # the patterns run over the original text and the surfaces are read from the
+                # folded one, which has the same offsets (as in Tokenizer.tokenize)
+                folded = fold_accents(text)
+                if per_line:
+                    pieces = [(line, folded_line) for line, folded_line in zip(text.split("\n"), folded.split("\n"))
+                              if line.strip()]
+                else:
+                    pieces = [(text, folded)]
+                document = array('I')
+                for piece, folded_piece in pieces:
+                    for match in tokenizer.regex.finditer(piece):
+                        start, end = match.span()
+                        key = (match.lastgroup, folded_piece[start:end])
+                        raw_id = ids.get(key)
+                        if raw_id is None:
+                            raw_id = ids[key] = len(surfaces)
+                            kinds.append(key[0])
+                            surfaces.append(key[1])
+                        document.append(raw_id)
+                document.tofile(tokens_file)
+                offsets.append(offsets[-1] + len(document))
+        with open(os.path.join(directory, cls.OFFSETS), "wb") as f:
+            offsets.tofile(f)
+        with open(os.path.join(directory, cls.LEXICON), "w", encoding="utf-8") as f:
+            json.dump({"kinds": kinds, "surfaces": surfaces}, f, ensure_ascii=False)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(signature, f)
+        return cls(directory)
+
+    @classmethod
+    def load_or_build(cls, directory: str, paths: list, texts, tokenizer: Tokenizer, per_line: bool = False, html: bool = False) -> "TokenCache":
+        """
+        Open the cache in directory if it was built from the same files and settings, or build it.
+        texts is only consumed when the cache has to be built.
+        """
+        manifest_path = os.path.join(directory, cls.MANIFEST)
+        if os.path.isfile(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                # the manifest goes through JSON, so compare it with a JSON round trip of the signature
+                if json.load(f) == json.loads(json.dumps(cls.signature(paths, tokenizer, per_line, html))):
+                    return cls(directory)
+        return cls.build(directory, paths, texts, tokenizer, per_line, html)
+
+    def term_mapping(self, lowercase: bool = True, html_tags: bool = False, stopwords_path: str = None,
+                     stemming_method: str = None, tokenizer: Tokenizer = None) -> tuple:
+        """
+        Normalize every lexicon entry once with the given settings, in the order tokenize applies them.
+        :param lowercase: Lowercase the tokens as Tokenizer.normalize does (only words, names and acronyms).
+        :param html_tags: Remove HTML tags left inside the tokens.
+        :param stopwords_path: Optional stopwords file; its words are removed.
+        :param stemming_method: Optional 'porter', 'lancaster' or 'snowball'.
+        :param tokenizer: Tokenizer that normalizes and stems; a default one if None.
+        :return: (array with the term id of each lexicon entry, or -1 if it is removed, list of terms).
+        """
+        tokenizer = tokenizer or Tokenizer()
+        stopword_filter = StopwordFilter.load(stopwords_path) if stopwords_path else None
+        stemmer = tokenizer.stemmer(stemming_method) if stemming_method else None
+        mapping = np.empty(len(self.surfaces), dtype=np.int64)
+        term_ids = {}
+        terms = []
+        for raw_id, (kind, surface) in enumerate(zip(self.kinds, self.surfaces)):
+            if lowercase:
+                term = tokenizer.normalize(surface, kind, html_tags)
+            elif html_tags and kind == "urls":
+                term = tokenizer.HTML_TAG.sub('', surface)
+            else:
+                term = surface
+            if stopword_filter is not None and term in stopword_filter:
+                mapping[raw_id] = -1
+                continue
+            if stemmer is not None:
+                term = stemmer.stem(term)
+            term_id = term_ids.get(term)
+            if term_id is None:
+                term_id = term_ids[term] = len(terms)
+                terms.append(term)
+            mapping[raw_id] = term_id
+        return mapping, terms
+
+    def documents(self, counts: bool = False, **settings):
+        """
+        The tokens of every document with the given normalization settings, like tokenize_text.
+        :param counts: Yield {term: count} dicts (in order of first occurrence) instead of token lists.
+        :param settings: Arguments for term_mapping (lowercase, html_tags, stopwords_path, stemming_method, tokenizer).
+        :return: A generator with one result per document, in collection order.
+        """
+        mapping, terms = self.term_mapping(**settings)
+        offsets = self.offsets
+        for i in range(len(self)):
+            ids = mapping[self.tokens[offsets[i]:offsets[i + 1]]]
+            ids = ids[ids >= 0]
+            if not counts:
+                yield [terms[term_id] for term_id in ids.tolist()]
+                continue
+            unique, first, freqs = np.unique(ids, return_index=True, return_counts=True)
+            order = np.argsort(first)
+            yield {terms[term_id]: freq for term_id, freq in zip(unique[order].tolist(), freqs[order].tolist())}
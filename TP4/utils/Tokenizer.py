@@ -1,5 +1,266 @@
+import os
+import pickle
 import re
-from nltk.stem import PorterStemmer, LancasterStemmer, SnowballStemmer
+import unicodedata
+from array import array
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from time import perf_counter
+from HtmlText import html_to_text
+
+# Latin, Greek and Cyrillic letters, super/subscripts and letterlike symbols, full-width forms
+FOLDED_RANGES = ((0x00A0, 0x2000), (0x2070, 0x2190), (0xFF00, 0xFFF0))
+
+def folding_table(lower: bool = False) -> str:
+    """
+    Translation table that removes the diacritics of every character in FOLDED_RANGES,
+    from its NFKD decomposition without the combining marks. Only one-to-one mappings
+    are kept, so folded text has the same offsets as the original; ñ/Ñ are letters of
+    their own in Spanish and are not folded.
+    :param lower: Also lowercase, in the same table (ASCII letters included).
+    :return: Table for str.translate, as a string indexed by code point (much faster than a dict).
+    """
+    table = [chr(code) for code in range(FOLDED_RANGES[-1][1])]
+    for first, last in FOLDED_RANGES:
+        for code in range(first, last):
+            char = table[code]
+            if char in "ñÑ":
+                continue
+            base = "".join(c for c in unicodedata.normalize("NFKD", char) if not unicodedata.combining(c))
+            if lower:
+                base = base.lower()
+            if len(base) == 1 and base.isalnum():
+                table[code] = base
+    if lower:
+        for code in range(ord("A"), ord("Z") + 1):
+            table[code] = chr(code + 32)
+        table[ord("Ñ")] = "ñ"
+    return "".join(table)
+
+FOLD = folding_table()
+FOLD_LOWER = folding_table(lower=True)
+
+def fold_accents(text: str) -> str:
+    """Remove the diacritics of a whole text in one pass (ASCII text is returned as is)."""
+    return text if text.isascii() else text.translate(FOLD)
+
+STEMMING_METHODS = ("porter", "lancaster", "snowball")
+
+def new_stemmer(method: str):
+    """
+    Build the NLTK stemmer of a method. nltk is imported here, on first use, because
+    importing it takes longer than most of the commands that never stem.
+    :param method: 'porter', 'lancaster' or 'snowball' (Spanish).
+    :return: The stemmer.
+    """
+    if method not in STEMMING_METHODS:
+        raise ValueError("Invalid method. Use 'porter', 'lancaster' or 'snowball'.")
+    from nltk.stem import PorterStemmer, LancasterStemmer, SnowballStemmer
+    if method == "porter":
+        return PorterStemmer()
+    if method == "lancaster":
+        return LancasterStemmer()
+    return SnowballStemmer("spanish")
+
+class CachedStemmer:
+    """
+    Wraps an NLTK stemmer with a bounded LRU table of the stems already computed.
+    Most token occurrences repeat a small vocabulary, so most calls are table hits.
+    """
+
+    def __init__(self, stemmer, maxsize: int = 100000, path: str = None):
+        """
+        :param stemmer: Object with a stem(word) method.
+        :param maxsize: Maximum number of words kept in the table.
+        :param path: Optional pickle file with a stem table saved by a previous run.
+        """
+        self.stemmer = stemmer
+        self.maxsize = maxsize
+        self.path = path
+        self.table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if path is not None and os.path.isfile(path):
+            with open(path, "rb") as f:
+                self.table.update(pickle.load(f))
+            while len(self.table) > maxsize:
+                self.table.popitem(last=False)
+
+    def stem(self, word: str) -> str:
+        stem = self.table.get(word)
+        if stem is not None:
+            self.hits += 1
+            self.table.move_to_end(word)
+            return stem
+        self.misses += 1
+        stem = self.stemmer.stem(word)
+        self.table[word] = stem
+        if len(self.table) > self.maxsize:
+            self.table.popitem(last=False)
+        return stem
+
+    def save(self):
+        """Write the stem table to path, so later runs start with it."""
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "wb") as f:
+            pickle.dump(dict(self.table), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    def __getstate__(self):
+        # a pickled copy starts with an empty table instead of carrying the whole table;
+        # workers keep their table by building their stemmers once, in a pool initializer
+        state = self.__dict__.copy()
+        state["table"] = OrderedDict()
+        return state
+
+class StopwordFilter:
+    """
+    Immutable set of stopwords loaded once. Instances loaded from a file are cached per
+    path and modification time, so every Tokenizer in a process shares the same set and
+    the file is only parsed again when it changes. Instances pickle as the set itself,
+    which makes them cheap to send to worker processes.
+    """
+    _cache = {}
+
+    def __init__(self, words):
+        self.words = frozenset(words)
+
+    @classmethod
+    def load(cls, path: str, separators: str = r'[, \n]+', normalize: bool = True) -> "StopwordFilter":
+        """
+        :param path: File with the stopwords.
+        :param separators: Regex that separates the words in the file.
+        :param normalize: Lowercase the words and fold their accents, like the tokens.
+        :return: The cached filter for the current version of the file.
+        """
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, separators, normalize)
+        stopword_filter = cls._cache.get(key)
+        if stopword_filter is None:
+            with open(path, 'r', encoding="utf-8") as file:
+                text = file.read()
+            if normalize:
+                text = fold_accents(text.lower())
+            stopword_filter = cls._cache[key] = cls(re.split(separators, text))
+        return stopword_filter
+
+    @classmethod
+    def from_nltk(cls, language: str = "spanish", cache_path: str = None) -> "StopwordFilter":
+        """
+        Load an NLTK stopword list without downloading it: from the local nltk_data if it is
+        installed, or else from cache_path, a plain copy written the last time it was.
+        :param language: NLTK stopwords language.
+        :param cache_path: Optional file with one stopword per line.
+        :return: Filter with the words as NLTK lists them (not normalized).
+        """
+        from nltk.corpus import stopwords
+        try:
+            words = stopwords.words(language)
+        except LookupError:
+            if cache_path is None or not os.path.isfile(cache_path):
+                raise LookupError(f"NLTK stopwords for {language} are not installed and there is no copy in {cache_path}; "
+                                  f"run nltk.download('stopwords') once.")
+            return cls.load(cache_path, r'\n+', normalize=False)
+        if cache_path is not None and not os.path.isfile(cache_path):
+            with open(cache_path, 'w', encoding="utf-8") as file:
+                file.write("\n".join(words))
+        return cls(words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.words
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __reduce__(self):
+        return type(self), (self.words,)
+
+    def filter(self, tokens: list) -> list:
+        words = self.words
+        return [token for token in tokens if token not in words]
+
+class Lexicon:
+    """
+    Term <-> id mapping for token streams, with ids assigned in order of first occurrence.
+    It also remembers the id of every surface form already seen (per normalization options
+    and token kind), so a repeated token is resolved with one dict lookup and the normalized
+    term is only built the first time a surface form appears.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.terms = []
+        self._surfaces = {}
+
+    def add(self, term: str) -> int:
+        term_id = self.ids.get(term)
+        if term_id is None:
+            term_id = self.ids[term] = len(self.terms)
+            self.terms.append(term)
+        return term_id
+
+    def surfaces(self, *options) -> dict:
+        """:return: The {kind: {surface form: term id}} memo for the given normalization options."""
+        return self._surfaces.setdefault(options, {})
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __getitem__(self, term_id: int) -> str:
+        return self.terms[term_id]
+
+class TokenStream:
+    """
+    Tokens of a text as parallel arrays of (start, end, kind, term id), where start:end is
+    the span of the token in the original text, kind indexes Tokenizer.KINDS and the term
+    id indexes the Lexicon. Position i of the stream is the i-th token of the text.
+    """
+
+    def __init__(self, text: str, lexicon: Lexicon):
+        self.text = text
+        self.lexicon = lexicon
+        self.starts = array('I')
+        self.ends = array('I')
+        self.kinds = array('B')
+        self.term_ids = array('I')
+
+    def __len__(self) -> int:
+        return len(self.term_ids)
+
+    def __iter__(self):
+        return zip(self.starts, self.ends, self.kinds, self.term_ids)
+
+    def surface(self, position: int) -> str:
+        return self.text[self.starts[position]:self.ends[position]]
+
+    def term(self, position: int) -> str:
+        return self.lexicon[self.term_ids[position]]
+
+    def positions(self) -> dict:
+        """:return: Dictionary mapping each term id to the array of its positions, for positional postings."""
+        positions = {}
+        for position, term_id in enumerate(self.term_ids):
+            term_positions = positions.get(term_id)
+            if term_positions is None:
+                term_positions = positions[term_id] = array('I')
+            term_positions.append(position)
+        return positions
+
+    def snippet(self, position: int, window: int = 5) -> str:
+        """
+        :param position: Position of the token to show.
+        :param window: Number of tokens to include on each side.
+        :return: The original text from window tokens before the position to window tokens after it.
+        """
+        first = max(position - window, 0)
+        last = min(position + window, len(self) - 1)
+        return self.text[self.starts[first]:self.ends[last]]
 
 class Tokenizer:
     PATTERNS = {
@@ -8,66 +269,284 @@ class Tokenizer:
         "numbers": r'\b\d{1,4}(?:[.-]?\d{1,4}){0,3}\b',
         "urls": r'\b(?:ftp|https|http)?://[^\s/$.?#].[^\s]*\b',
         "emails": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b',
-        "names": r'\b[A-Z][a-z]+(?:\s[A-Z][a-z]+)*\b(?!\.)',
+        "names": r'\b[A-Z][a-z]+(?:[ \t][A-Z][a-z]+)*\b(?!\.)',  # never across lines
         "dates": r'\b\d{2}[-/.]\d{2}[-/.]\d{4}\b',
         "words": r'[a-zA-ZáéíóúüñÁÉÍÓÚÜÑ]+(?:-[a-zA-Z]+)*'
     }
+    KINDS = list(PATTERNS)  # TokenStream.kinds stores the index of the kind in this list
+    HTML_TAG = re.compile(r'<[^>]+>')
+    STAGES = ("findall", "accents", "lowercase", "html_tags", "stopwords", "stemming")
+    profile = None  # {stage: seconds} while profiling is enabled
+
+    def __init__(self, stem_cache_size: int = 100000, stem_cache_dir: str = None, **kwargs):
+        # constructor arguments, to build the same tokenizer in worker processes
+        self.options = dict(kwargs, stem_cache_size=stem_cache_size, stem_cache_dir=stem_cache_dir)
+        kinds = [key for key in self.PATTERNS if kwargs.get(key, False)] or list(self.PATTERNS)
+        # one named group per token kind, so match.lastgroup tells which pattern matched
+        self.regex = re.compile('|'.join(f'(?P<{kind}>{self.PATTERNS[kind]})' for kind in kinds))
+        self.stem_cache_size = stem_cache_size
+        self.stem_cache_dir = stem_cache_dir
+        self.stemmers = {}  # built on first use by stemmer()
+
+    def enable_profiling(self) -> dict:
+        """
+        Make tokenize run its stages one after the other and add the seconds spent in each
+        to a dictionary. The staged path is slower and only meant for benchmarks.
+        :return: The {stage: seconds} dictionary, also available as self.profile.
+        """
+        self.profile = dict.fromkeys(self.STAGES, 0.0)
+        return self.profile
+
+    def disable_profiling(self):
+        self.profile = None
+
+    def stemmer(self, method: str = "porter") -> CachedStemmer:
+        """
+        :param method: 'porter', 'lancaster' or 'snowball'.
+        :return: The cached stemmer of the method, built (and its stem table loaded) the first time it is needed.
+        """
+        stemmer = self.stemmers.get(method)
+        if stemmer is None:
+            path = os.path.join(self.stem_cache_dir, f"stems_{method}.pkl") if self.stem_cache_dir else None
+            stemmer = self.stemmers[method] = CachedStemmer(new_stemmer(method), self.stem_cache_size, path)
+        return stemmer
+
+    @property
+    def porter(self) -> CachedStemmer:
+        return self.stemmer("porter")
+
+    @property
+    def lancaster(self) -> CachedStemmer:
+        return self.stemmer("lancaster")
 
-    def __init__(self, **kwargs):
-        patterns = [regex for key, regex in self.PATTERNS.items() if kwargs.get(key, False)]
-        self.regex = re.compile('|'.join(patterns) if patterns else '|'.join(self.PATTERNS.values()))
-        self.porter = PorterStemmer()
-        self.lancaster = LancasterStemmer()
-        self.snowball = SnowballStemmer("spanish")
+    @property
+    def snowball(self) -> CachedStemmer:
+        return self.stemmer("snowball")
+
+    def save_stems(self):
+        """Persist the stem tables of the stemmers used, when the tokenizer was built with a stem_cache_dir."""
+        for stemmer in self.stemmers.values():
+            stemmer.save()
 
     def remove_html_tags(self, text_list):
-        return [re.sub(r'<[^>]+>', '', text) for text in text_list]
+        return [self.HTML_TAG.sub('', text) for text in text_list]
 
     def remove_accents(self, text_list):
-        replacement = str.maketrans("áéíóúüÁÉÍÓÚÜ", "aeiouuAEIOUU")
-        text_without_accents = []
-        for word in text_list:
-            word = word.translate(replacement)
-            text_without_accents.append(word)
-        return text_without_accents
+        return [fold_accents(word) for word in text_list]
     
     def stemming(self, text_list, method = "porter"):
-        if method == "porter":
-            stemmed_list = [self.porter.stem(word) for word in text_list]
-        elif method == "lancaster":
-            stemmed_list = [self.lancaster.stem(word) for word in text_list]
-        elif method == "snowball":
-            stemmed_list = [self.snowball.stem(word) for word in text_list]
-        else:
-            raise ValueError("Invalid method. Use 'porter', 'lancaster' or 'snowball'.")
-        return stemmed_list
+        stemmer = self.stemmer(method)
+        return [stemmer.stem(word) for word in text_list]
 
     def remove_stopwords(self, text_list, stopwords_path):
-        with open(stopwords_path, 'r', encoding="utf-8") as file:
-            stopwords = file.read()
-        stopwords = stopwords.lower()
-        stopwords = re.split(r'[, \n]+', stopwords)
-        stopwords = self.remove_accents(stopwords)
-        text_without_stopwords = []
-        
-        for word in text_list:
-            if word not in stopwords:
-                text_without_stopwords.append(word)
-        return text_without_stopwords
+        return StopwordFilter.load(stopwords_path).filter(text_list)
+
+    def normalize(self, token: str, kind: str, html_tags: bool = False) -> str:
+        """
+        Normalize a token matched by the pattern of the given kind in a text already
+        folded by fold_accents.
+        :param token: The matched text.
+        :param kind: Name of the pattern that matched it (match.lastgroup).
+        :param html_tags: Remove HTML tags left inside the token.
+        :return: The normalized term.
+        """
+        if kind == "words":
+            # words with ñ/Ñ, the only letter left outside [a-zA-Z], keep their case
+            if token.isascii():
+                token = token.lower()
+        elif kind == "names" or kind == "acronyms":
+            # single names and acronyms without dots are plain words
+            if token.isalpha():
+                token = token.lower()
+        elif kind == "urls":
+            if html_tags:
+                # the only kind that can contain '<'
+                token = self.HTML_TAG.sub('', token)
+        return token
 
     def tokenize(self, text, html_tags: bool = False, stopwords: bool = False, stopwords_path: str = None, stemming: bool = False, stemming_method: str = "porter"):
-        text_list = self.regex.findall(text)
-        text_list = self.remove_accents(text_list)
-        if html_tags:
-            text_list = self.remove_html_tags(text_list)
+        """
+        Tokenize text in a single pass over the pattern matches, lowercasing each token
+        according to the kind of pattern that matched it: ASCII words (letters and hyphens)
+        and names and acronyms made only of letters are lowercased; numbers, dates, URLs,
+        emails and abbreviations keep their case. The patterns run over the original text,
+        so accents decide where tokens start and end as they always did; the accents of the
+        whole text are folded once and each token is read from the folded text.
+        """
+        if self.profile is not None:
+            return self._tokenize_profiled(text, html_tags, stopwords, stopwords_path, stemming, stemming_method)
+        return self._tokenize_folded(text, fold_accents(text), html_tags, stopwords, stopwords_path, stemming, stemming_method)
+
+    def _tokenize_folded(self, text, folded, html_tags=False, stopwords=False, stopwords_path=None, stemming=False, stemming_method="porter"):
+        # folded is fold_accents(text): folding is one-to-one, so the spans of the matches over text are valid in it
         processed_tokens = []
-        for token in text_list:
-            # Aplicar minúscula solo a palabras normales
-            if re.fullmatch(r'[a-zA-Z]+(?:-[a-zA-Z]+)*', token):
-                token = token.lower()
+        ascii_text = folded is text
+        # the rules of normalize, inlined: a method call per token costs ~10% here
+        for match in self.regex.finditer(text):
+            if ascii_text:
+                token = match.group()
+            else:
+                start, end = match.span()
+                token = folded[start:end]
+            kind = match.lastgroup
+            if kind == "words":
+                if token.isascii():
+                    token = token.lower()
+            elif kind == "names" or kind == "acronyms":
+                if token.isalpha():
+                    token = token.lower()
+            elif kind == "urls" and html_tags:
+                token = self.HTML_TAG.sub('', token)
             processed_tokens.append(token)
         if stopwords:
             processed_tokens = self.remove_stopwords(processed_tokens, stopwords_path)
         if stemming:
             processed_tokens = self.stemming(processed_tokens, stemming_method)
-        return processed_tokens
\ No newline at end of file
+        return processed_tokens
+
+    def _tokenize_profiled(self, text, html_tags, stopwords, stopwords_path, stemming, stemming_method):
+        # the same rules as tokenize, one stage at a time
+        profile = self.profile
+        start = perf_counter()
+        folded = fold_accents(text)
+        end = perf_counter()
+        profile["accents"] += end - start
+
+        start = end
+        matches = [(match.span(), match.lastgroup) for match in self.regex.finditer(text)]
+        tokens = [folded[first:last] for (first, last), _ in matches]
+        kinds = [kind for _, kind in matches]
+        end = perf_counter()
+        profile["findall"] += end - start
+
+        start = end
+        tokens = [token.lower() if (kind == "words" and token.isascii())
+                  or ((kind == "names" or kind == "acronyms") and token.isalpha()) else token
+                  for token, kind in zip(tokens, kinds)]
+        end = perf_counter()
+        profile["lowercase"] += end - start
+
+        if html_tags:
+            start = end
+            tokens = [self.HTML_TAG.sub('', token) if kind == "urls" else token for token, kind in zip(tokens, kinds)]
+            end = perf_counter()
+            profile["html_tags"] += end - start
+        if stopwords:
+            start = end
+            tokens = self.remove_stopwords(tokens, stopwords_path)
+            end = perf_counter()
+            profile["stopwords"] += end - start
+        if stemming:
+            start = end
+            tokens = self.stemming(tokens, stemming_method)
+            profile["stemming"] += perf_counter() - start
+        return tokens
+
+    def token_stream(self, text: str, lexicon: Lexicon = None, html_tags: bool = False, stemming: bool = False, stemming_method: str = "porter") -> TokenStream:
+        """
+        Tokenize text into a TokenStream of spans over the original text instead of a list of strings.
+        The patterns run over the original text and the terms are read from the folded text,
+        whose offsets are the same.
+        Terms are normalized (and stemmed) only the first time each surface form is seen by the lexicon.
+        :param text: Text to tokenize.
+        :param lexicon: Lexicon to resolve and add the terms, shared between the texts of a collection.
+        :param html_tags: Remove HTML tags left inside the tokens.
+        :param stemming: Stem the terms.
+        :param stemming_method: 'porter', 'lancaster' or 'snowball'.
+        :return: The stream, whose lexicon is the one given or a new one.
+        """
+        if lexicon is None:
+            lexicon = Lexicon()
+        stemmer = self.stemmer(stemming_method) if stemming else None
+        memo = lexicon.surfaces(html_tags, stemming_method if stemming else None)
+        kind_codes = {kind: code for code, kind in enumerate(self.KINDS)}
+        stream = TokenStream(text, lexicon)
+        starts, ends, kinds, term_ids = stream.starts, stream.ends, stream.kinds, stream.term_ids
+        folded = fold_accents(text)
+        for match in self.regex.finditer(text):
+            kind = match.lastgroup
+            surfaces = memo.get(kind)
+            if surfaces is None:
+                surfaces = memo[kind] = {}
+            start, end = match.span()
+            token = folded[start:end]
+            term_id = surfaces.get(token)
+            if term_id is None:
+                term = self.normalize(token, kind, html_tags)
+                if stemmer is not None:
+                    term = stemmer.stem(term)
+                term_id = surfaces[token] = lexicon.add(term)
+            starts.append(start)
+            ends.append(end)
+            kinds.append(kind_codes[kind])
+            term_ids.append(term_id)
+        return stream
+
+    def tokenize_text(self, text: str, counts: bool = False, per_line: bool = False, html: bool = False, **kwargs):
+        """
+        Tokenize one text for tokenize_many.
+        :param text: Text to tokenize.
+        :param counts: Return a {term: count} dict (in order of first occurrence) instead of the token list.
+        :param per_line: Tokenize each non-blank line on its own, like the callers that read files line by line.
+        :param html: The text is an HTML document: tokenize only its title and body text, without markup, scripts or styles.
+        :param kwargs: Arguments for tokenize (html_tags, stopwords, stemming...).
+        """
+        if html:
+            title, body = html_to_text(text)
+            text = title + "\n" + body
+        if self.profile is not None:
+            pieces = [line for line in text.split("\n") if line.strip()] if per_line else [text]
+            tokens = [token for piece in pieces for token in self.tokenize(piece, **kwargs)]
+            return dict(Counter(tokens)) if counts else tokens
+        # the accents of the whole document are folded at once; folding keeps the offsets,
+        # so the folded text splits into the same lines
+        folded = fold_accents(text)
+        if per_line:
+            tokens = []
+            lines = text.split("\n")
+            for line, folded_line in zip(lines, lines if folded is text else folded.split("\n")):
+                if line.strip():
+                    tokens.extend(self._tokenize_folded(line, folded_line, **kwargs))
+        else:
+            tokens = self._tokenize_folded(text, folded, **kwargs)
+        return dict(Counter(tokens)) if counts else tokens
+
+    def tokenize_many(self, texts, workers: int = 1, chunksize: int = 64, counts: bool = False, per_line: bool = False, **kwargs):
+        """
+        Tokenize many texts, in order. With workers > 1 batches of chunksize texts are
+        tokenized in a process pool where each worker builds its own Tokenizer (and stemmers)
+        once, with at most 2 * workers batches in flight.
+        :param texts: Iterable of texts, consumed lazily.
+        :param workers: Number of worker processes.
+        :param chunksize: Texts sent to a worker at a time.
+        :param counts: Yield {term: count} dicts instead of token lists.
+        :param per_line: Tokenize each non-blank line of a text on its own.
+        :param kwargs: Arguments for tokenize_text (html) and tokenize (html_tags, stopwords, stemming...).
+        :return: A generator with one result per text.
+        """
+        if workers <= 1:
+            for text in texts:
+                yield self.tokenize_text(text, counts, per_line, **kwargs)
+            return
+
+        texts = iter(texts)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.options,)) as pool:
+            pending = deque()
+            while True:
+                batch = list(islice(texts, chunksize))
+                if batch:
+                    pending.append(pool.submit(_tokenize_batch, batch, counts, per_line, kwargs))
+                if pending and (not batch or len(pending) >= workers * 2):
+                    yield from pending.popleft().result()
+                if not batch and not pending:
+                    break
+
+
+_worker_tokenizer = None
+
+def _init_worker(options: dict):
+    global _worker_tokenizer
+    _worker_tokenizer = Tokenizer(**options)
+
+def _tokenize_batch(texts: list, counts: bool, per_line: bool, kwargs: dict) -> list:
+    return [_worker_tokenizer.tokenize_text(text, counts, per_line, **kwargs) for text in texts]
@@ -0,0 +1,81 @@
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+DOC_PATTERN = re.compile(rb'<DOC>(.*?)</DOC>', re.IGNORECASE | re.DOTALL)
+DOCNO_PATTERN = re.compile(rb'<DOCNO>\s*(.*?)\s*</DOCNO>', re.IGNORECASE | re.DOTALL)
+
+
+def read_trec(path: str, encoding: str = "utf-8", block_size: int = 1 << 20):
+    """
+    Stream the documents of a TREC file, scanning the raw bytes block by block.
+    :param path: Path to the TREC file.
+    :param encoding: Encoding used to decode the document text.
+    :param block_size: Bytes read from disk per block.
+    :return: A generator of (docno, text) tuples, where text is everything inside <DOC> but the <DOCNO> element.
+    """
+    with open(path, "rb") as file:
+        buffer = b""
+        while True:
+            block = file.read(block_size)
+            buffer += block
+            end = 0
+            for match in DOC_PATTERN.finditer(buffer):
+                end = match.end()
+                body = match.group(1)
+                docno_match = DOCNO_PATTERN.search(body)
+                if docno_match is None:
+                    yield None, body.decode(encoding, errors="replace")
+                    continue
+                docno = docno_match.group(1).decode("ascii", errors="replace")
+                text = body[:docno_match.start()] + b"\n" + body[docno_match.end():]
+                yield docno, text.decode(encoding, errors="replace")
+            # the tail of the buffer holds the document that is still incomplete
+            buffer = buffer[end:]
+            if not block:
+                break
+
+
+def _apply(function, texts: list) -> list:
+    return [function(text) for text in texts]
+
+
+def map_trec(path: str, function, workers: int = 1, batch_size: int = 256, encoding: str = "utf-8",
+             initializer=None, initargs: tuple = ()):
+    """
+    Apply function to the text of every document of a TREC file, in file order.
+    With workers > 1 batches of documents are processed in a process pool, so
+    function must be picklable (a module level function or a functools.partial of one).
+    :param path: Path to the TREC file.
+    :param function: Callable applied to each document text (e.g. a tokenizer).
+    :param workers: Number of worker processes.
+    :param batch_size: Documents sent to a worker at a time.
+    :param encoding: Encoding used to decode the document text.
+    :param initializer: Optional callable run once in every process that applies function
+        (each worker, or this process when workers <= 1), to build state such as a tokenizer
+        that function keeps for all its documents instead of receiving it with every batch.
+    :param initargs: Arguments for initializer.
+    :return: A generator of (docno, function(text)) tuples.
+    """
+    documents = read_trec(path, encoding)
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for docno, text in documents:
+            yield docno, function(text)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        # a bounded window of batches in flight keeps memory independent of the corpus size
+        pending = deque()
+        while True:
+            batch = list(islice(documents, batch_size))
+            if batch:
+                docnos = [docno for docno, _ in batch]
+                pending.append((docnos, pool.submit(_apply, function, [text for _, text in batch])))
+            if pending and (not batch or len(pending) >= workers * 2):
+                docnos, future = pending.popleft()
+                yield from zip(docnos, future.result())
+            if not batch and not pending:
+                break
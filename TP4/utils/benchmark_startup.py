@@ -0,0 +1,102 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Startup cost of the command line scripts: wall time to start a new interpreter and import
+# each script (without running its main), and the imports of each script that take longest,
+# from python -X importtime. Results can be saved as JSON and compared with a previous run.
+# usage: python benchmark_startup.py [script.py]... [--repeat N] [--top N] [--json output.json] [--baseline previous.json]
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CLIS = [
+    "TP1/punto1.py", "TP1/punto2.py", "TP1/punto3.py", "TP1/punto4.py", "TP1/punto5.py", "TP1/punto6.py",
+    "TP1/punto7.py", "TP1/punto8.py", "TP1/punto9.py",
+    "TP2/punto5/punto5.py",
+    "TP4/punto1/punto1.py", "TP4/punto2/punto2.py", "TP4/punto3/punto3_disk.py", "TP4/punto3/punto3_memory.py",
+    "TP4/punto4/punto4.py", "TP4/punto5/punto5.py", "TP4/punto6/punto6.py", "TP4/punto7/punto7.py",
+]
+
+
+def parse_importtime(stderr: str) -> list:
+    """:return: (cumulative seconds, module) of the modules imported directly by top level imports, slowest first."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # each level of nesting indents the name two more spaces
+        if len(name) - len(name.lstrip(" ")) == 3:
+            imports.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(imports, reverse=True)
+
+
+def startup(script: str, repeat: int = 3) -> dict:
+    """
+    Import a script in new interpreters, from its own directory like when it is run.
+    :return: Best wall time, the top level imports of the last run and the error, if the import failed.
+    """
+    path = os.path.join(ROOT, script)
+    directory = os.path.dirname(path)
+    module = os.path.splitext(os.path.basename(path))[0]
+    code = f"import sys; sys.path.insert(0, {directory!r}); import {module}"
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=directory,
+                                 capture_output=True, text=True)
+        best = min(best, time.perf_counter() - start)
+    error = None
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()[-1]
+    return {"seconds": best, "imports": parse_importtime(process.stderr), "error": error}
+
+
+def tokenizer_construction() -> float:
+    """Seconds to import the Tokenizer and build a first one, in a new interpreter."""
+    code = ("import time; start = time.perf_counter(); from Tokenizer import Tokenizer; Tokenizer(); "
+            "print(time.perf_counter() - start)")
+    process = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                             capture_output=True, text=True, check=True)
+    return float(process.stdout)
+
+
+def main():
+    args = sys.argv[1:]
+    options = {"--repeat": "3", "--top": "5", "--json": None, "--baseline": None}
+    for name in options:
+        if name in args:
+            i = args.index(name)
+            options[name] = args[i + 1]
+            del args[i:i + 2]
+    scripts = args or CLIS
+    repeat, top = int(options["--repeat"]), int(options["--top"])
+    baseline = {}
+    if options["--baseline"]:
+        with open(options["--baseline"], "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    results = {}
+    for script in scripts:
+        result = results[script] = startup(script, repeat)
+        previous = baseline.get(script)
+        change = f" (before {previous['seconds']:.3f}s)" if previous else ""
+        print(f"{script:<32} {result['seconds']:.3f}s{change}")
+        if result["error"]:
+            print(f"    import failed: {result['error']}")
+        for seconds, module in result["imports"][:top]:
+            print(f"    {seconds:8.3f}s  {module}")
+
+    results["Tokenizer()"] = {"seconds": tokenizer_construction()}
+    previous = baseline.get("Tokenizer()")
+    change = f" (before {previous['seconds']:.3f}s)" if previous else ""
+    print(f"{'import + Tokenizer()':<32} {results['Tokenizer()']['seconds']:.3f}s{change}")
+
+    if options["--json"]:
+        with open(options["--json"], "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import json
+import os
+import sys
+import time
+from Tokenizer import Tokenizer
+
+# Tokens per second of the Tokenizer for each pattern family alone, for all of them and for
+# all of them but one (what each branch of the alternation costs), on corpora and on
+# adversarial inputs, plus the time per tokenize stage with profiling enabled.
+# usage: python benchmark_tokenizer.py [file or directory]... [--repeat N] [--stopwords path] [--json output.json]
+
+
+def adversarial_texts(size: int = 2000) -> dict:
+    """Inputs that make some branches backtrack or match very long tokens."""
+    return {
+        "long names": ["Juan Carlos Perez Gomez Rodriguez Fernandez " * 20 + "fin."] * (size // 20),
+        "capitalized sentences": ["Hola Mundo. Otra Frase Con Mayusculas Seguidas, Y Mas." * 4] * (size // 4),
+        "url-like": ["ver http://" + "a.b-c/" * 200 + " y ://x." + "." * 100 + " fin"] * (size // 20),
+        "dotted numbers": [" ".join(f"{i}.{i + 1}.{i + 2}.{i + 3}.{i + 4}-{i}" for i in range(50))] * (size // 50),
+        "email-like": [" ".join("usuario.largo_" * 10 + "@" for _ in range(20))] * (size // 20),
+        "acronyms": [" ".join("A.B.C.D.E.F.G.H.I" if i % 2 else "ABCDEFGHIJKLMNOP" for i in range(50))] * (size // 50),
+        "html": ['<a href="http://example.com/pagina">Página de ejemplo</a> <p class="x">Texto común</p>' * 5] * (size // 5),
+    }
+
+
+def read_corpus(path: str) -> list:
+    paths = [path] if not os.path.isdir(path) else [
+        os.path.join(root, name) for root, _, names in os.walk(path) for name in sorted(names)]
+    lines = []
+    for file_path in paths:
+        with open(file_path, "r", encoding="utf-8", errors="replace") as file:
+            lines.extend(line for line in file if line.strip())
+    return lines
+
+
+def configurations() -> dict:
+    families = list(Tokenizer.PATTERNS)
+    configs = {family: {family: True} for family in families}
+    configs["all"] = {}
+    for family in families:
+        configs[f"all - {family}"] = {other: True for other in families if other != family}
+    return configs
+
+
+def throughput(tokenizer: Tokenizer, lines: list, repeat: int) -> tuple:
+    """:return: (tokens per second, characters per second, tokens) using the best of repeat runs."""
+    best = float("inf")
+    tokens = 0
+    for _ in range(repeat):
+        tokens = 0
+        start = time.perf_counter()
+        for line in lines:
+            tokens += len(tokenizer.tokenize(line))
+        best = min(best, time.perf_counter() - start)
+    if best <= 0:
+        return 0.0, 0.0, tokens
+    # characters per second still measures the scan when a family matches nothing
+    return tokens / best, sum(map(len, lines)) / best, tokens
+
+
+def profile_stages(lines: list, stopwords_path: str = None) -> dict:
+    """
+    Time each tokenize stage with every pattern enabled, stemming and, if a path is
+    given, stopwords, and check that the staged path returns the same tokens.
+    """
+    tokenizer = Tokenizer()
+    options = {"html_tags": True, "stemming": True, "stopwords": stopwords_path is not None, "stopwords_path": stopwords_path}
+    expected = [tokenizer.tokenize(line, **options) for line in lines]
+    profile = tokenizer.enable_profiling()
+    actual = [tokenizer.tokenize(line, **options) for line in lines]
+    tokenizer.disable_profiling()
+    if actual != expected:
+        raise AssertionError("the profiled tokenize returned different tokens")
+    return profile
+
+
+def main():
+    args = sys.argv[1:]
+    options = {"--repeat": "3", "--stopwords": None, "--json": None}
+    for name in options:
+        if name in args:
+            i = args.index(name)
+            options[name] = args[i + 1]
+            del args[i:i + 2]
+    repeat = int(options["--repeat"])
+
+    inputs = {os.path.basename(os.path.normpath(path)): read_corpus(path) for path in args}
+    inputs.update(adversarial_texts())
+    results = {}
+    for input_name, lines in inputs.items():
+        print(f"== {input_name} ({len(lines)} lines)")
+        results[input_name] = {}
+        for config_name, config in configurations().items():
+            rate, chars_rate, tokens = throughput(Tokenizer(**config), lines, repeat)
+            results[input_name][config_name] = {"tokens_per_second": rate, "chars_per_second": chars_rate, "tokens": tokens}
+            print(f"  {config_name:<20} {rate:>12,.0f} tokens/s {chars_rate:>14,.0f} chars/s  ({tokens} tokens)")
+
+    corpus = [line for lines in inputs.values() for line in lines]
+    profile = profile_stages(corpus, options["--stopwords"])
+    total = sum(profile.values())
+    print("== tokenize stages (all patterns, all inputs)")
+    for stage, seconds in profile.items():
+        print(f"  {stage:<10} {seconds:8.4f}s  {100 * seconds / total if total else 0:5.1f}%")
+    results["stages"] = profile
+
+    if options["--json"]:
+        with open(options["--json"], "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
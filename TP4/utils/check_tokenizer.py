@@ -0,0 +1,93 @@
+import os
+import re
+import sys
+from Tokenizer import Lexicon, Tokenizer, fold_accents
+
+# Differential check of Tokenizer.tokenize against the original three-pass implementation,
+# on the same raw text, and of Tokenizer.token_stream against Tokenizer.tokenize.
+# The only intended difference is the accent folding of each token, which now covers every
+# letter with diacritics instead of áéíóúü; the original side uses the same fold_accents.
+# Names joined by whitespace other than spaces and tabs (now split on purpose) are reported.
+# usage: python check_tokenizer.py <file or directory>...
+
+# the patterns of the original tokenizer, unchanged
+LEGACY_PATTERNS = {
+    "abbreviations": r'\b(?:Dr|Lic|Ing|Sr|Sra|S\.A|etc)\.\b',
+    "acronyms": r'\b[A-Z](?:\.?[A-Z]+){1,7}\b',
+    "numbers": r'\b\d{1,4}(?:[.-]?\d{1,4}){0,3}\b',
+    "urls": r'\b(?:ftp|https|http)?://[^\s/$.?#].[^\s]*\b',
+    "emails": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b',
+    "names": r'\b[A-Z][a-z]+(?:\s[A-Z][a-z]+)*\b(?!\.)',
+    "dates": r'\b\d{2}[-/.]\d{2}[-/.]\d{4}\b',
+    "words": r'[a-zA-ZáéíóúüñÁÉÍÓÚÜÑ]+(?:-[a-zA-Z]+)*'
+}
+
+
+def legacy_tokenize(options: dict, text: str, html_tags: bool = False) -> list:
+    """The original tokenizer (without stopwords and stemming), folding each token with fold_accents."""
+    patterns = [regex for key, regex in LEGACY_PATTERNS.items() if options.get(key, False)]
+    regex = re.compile('|'.join(patterns) if patterns else '|'.join(LEGACY_PATTERNS.values()))
+    text_list = regex.findall(text)
+    text_list = [fold_accents(word) for word in text_list]
+    if html_tags:
+        text_list = [re.sub(r'<[^>]+>', '', text) for text in text_list]
+    processed_tokens = []
+    for token in text_list:
+        if re.fullmatch(r'[a-zA-Z]+(?:-[a-zA-Z]+)*', token):
+            token = token.lower()
+        processed_tokens.append(token)
+    return processed_tokens
+
+
+def files(paths: list):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def check(paths: list) -> int:
+    """
+    :param paths: Files or directories to tokenize line by line.
+    :return: Number of lines where both implementations differ.
+    """
+    kinds = {
+        "all": {},
+        "words": {"words": True},
+        "TP1": {"words": True, "names": True, "abbreviations": True, "numbers": True},
+    }
+    tokenizers = {name: Tokenizer(**options) for name, options in kinds.items()}
+    names_separator = re.compile(r'[A-Z][a-z]+[^\S \t][A-Z][a-z]')
+    lexicons = {(name, html_tags): Lexicon() for name in kinds for html_tags in (False, True)}
+    lines = differences = 0
+    for path in files(paths):
+        with open(path, "r", encoding="utf-8", errors="replace") as file:
+            for line in file:
+                lines += 1
+                for name, tokenizer in tokenizers.items():
+                    for html_tags in (False, True):
+                        expected = legacy_tokenize(kinds[name], line, html_tags)
+                        actual = tokenizer.tokenize(line, html_tags=html_tags)
+                        if expected != actual and names_separator.search(line):
+                            print(f"{path} [{name}, html_tags={html_tags}]: names split at a line break or "
+                                  f"other whitespace (intended): {line!r}")
+                        elif expected != actual:
+                            differences += 1
+                            print(f"{path} [{name}, html_tags={html_tags}]: {line!r}\n  expected {expected}\n  actual   {actual}")
+                        stream = tokenizer.token_stream(line, lexicons[name, html_tags], html_tags=html_tags)
+                        streamed = [stream.term(position) for position in range(len(stream))]
+                        if streamed != actual:
+                            differences += 1
+                            print(f"{path} [{name}, html_tags={html_tags}, stream]: {line!r}\n  expected {actual}\n  actual   {streamed}")
+    print(f"{lines} lines checked, {differences} differences")
+    return differences
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python check_tokenizer.py <file or directory>...")
+        sys.exit(1)
+    sys.exit(1 if check(sys.argv[1:]) else 0)